@@ -1,6 +1,7 @@
 """
 Configuration management for the Mode_0 bot.
 """
+import asyncio
 import json
 import os
 import logging
@@ -8,13 +9,65 @@ from pathlib import Path
 
 logger = logging.getLogger("mode_0.config")
 
+# Marks keys missing on one side of a diff
+_MISSING = object()
+
+def flatten(config, prefix=""):
+    """Map every dot-notation key, including intermediate sections, to its value"""
+    flat = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+    return flat
+
+class ConfigValue:
+    """Bound, pre-resolved config value; read .value on hot paths"""
+    
+    __slots__ = ("key", "default", "type", "value")
+    
+    def __init__(self, key, default=None, type=None):
+        self.key = key
+        self.default = default
+        self.type = type
+        self.value = default
+    
+    def refresh(self, flat):
+        """Re-resolve against a freshly flattened config"""
+        value = flat.get(self.key, self.default)
+        if self.type is not None and value is not None:
+            try:
+                value = self.type(value)
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid value for {self.key}: {value!r}, using default")
+                value = self.default
+        self.value = value
+
 class ConfigManager:
     """Manages bot configuration"""
     
-    def __init__(self, config_path="mode_0/config/config.json"):
+    def __init__(self, config_path="mode_0/config/config.json", save_delay=1.0, max_save_delay=5.0):
         self.config_path = config_path
         self.config = {}
         
+        # Every dot-notation key resolved up front, rebuilt on load and set()
+        self._flat = {}
+        self._accessors = {}
+        
+        # (prefix, callback) pairs notified when matching keys change
+        self._subscribers = []
+        self._last_stat = None
+        
+        # Debounced saves; _saving stops the watcher reloading our own writes
+        self.save_delay = save_delay
+        self.max_save_delay = max_save_delay
+        self._save_handle = None
+        self._save_due = None
+        self._save_task = None
+        self._save_lock = asyncio.Lock()
+        self._saving = False
+        
         # Load configuration
         self.load_config()
     
@@ -34,23 +87,124 @@ class ConfigManager:
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON in configuration file: {self.config_path}")
             self.config = {}
+        self._last_stat = self._stat()
+        self._rebuild()
+    
+    def _rebuild(self):
+        """Re-flatten the config and refresh bound accessors, returning the previous flat map"""
+        previous = self._flat
+        self._flat = flatten(self.config)
+        for accessor in self._accessors.values():
+            accessor.refresh(self._flat)
+        return previous
+    
+    def subscribe(self, prefix, callback):
+        """Call callback with {key: new value} when keys under prefix change
+        
+        An empty prefix matches every key. Removed keys are reported as None.
+        Coroutine callbacks are scheduled on the running loop.
+        """
+        self._subscribers.append((prefix, callback))
+    
+    def _notify(self, previous):
+        """Tell subscribers which of their keys differ from the previous flat map"""
+        changed = [
+            key for key in previous.keys() | self._flat.keys()
+            if previous.get(key, _MISSING) != self._flat.get(key, _MISSING)
+        ]
+        if not changed:
+            return
+        
+        for prefix, callback in list(self._subscribers):
+            matched = {
+                key: self._flat.get(key)
+                for key in changed
+                if not prefix or key == prefix or key.startswith(f"{prefix}.")
+            }
+            if not matched:
+                continue
+            try:
+                result = callback(matched)
+                if asyncio.iscoroutine(result):
+                    asyncio.get_running_loop().create_task(result)
+            except Exception as e:
+                logger.error(f"Error applying configuration change for {prefix or 'all keys'}: {e}")
+    
+    def _validate(self, config):
+        """Reason the config can't be applied, or None if it is acceptable
+        
+        Settings that already exist must keep their type, so a typo can't
+        turn a rate into a string while the bot is running.
+        """
+        if not isinstance(config, dict):
+            return "top level must be an object"
+        for key, value in flatten(config).items():
+            current = self._flat.get(key)
+            if current is None or value is None:
+                continue
+            numbers = (int, float)
+            if isinstance(current, numbers) and not isinstance(current, bool):
+                if isinstance(value, numbers) and not isinstance(value, bool):
+                    continue
+            elif isinstance(value, type(current)):
+                continue
+            return f"{key} must be {type(current).__name__}, got {type(value).__name__}"
+        return None
+    
+    def reload(self):
+        """Re-read the file and swap it in if valid, notifying subscribers"""
+        try:
+            with open(self.config_path, 'r') as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Could not reload {self.config_path}, keeping current settings: {e}")
+            return False
+        
+        error = self._validate(config)
+        if error:
+            logger.error(f"Rejected configuration change in {self.config_path}: {error}")
+            return False
+        
+        # Swapped in one step, so readers never see a half-applied config
+        self.config = config
+        self._notify(self._rebuild())
+        logger.info(f"Configuration reloaded from {self.config_path}")
+        return True
+    
+    def _stat(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    async def watch(self, interval=2.0):
+        """Reload the file whenever it changes on disk"""
+        while True:
+            await asyncio.sleep(interval)
+            if self._saving:
+                continue
+            stat = self._stat()
+            if stat is None or stat == self._last_stat:
+                continue
+            self._last_stat = stat
+            self.reload()
     
     def get(self, key, default=None):
-        """Get configuration value by dot-notation key"""
-        if not self.config:
-            return default
-            
-        # Handle dot notation (e.g., "twitch.oauth_token")
-        keys = key.split(".")
-        value = self.config
+        """Get configuration value by dot-notation key (e.g., "twitch.oauth_token")"""
+        return self._flat.get(key, default)
+    
+    def accessor(self, key, default=None, type=None):
+        """Bound value for a key that stays current across set() and reloads
         
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-                
-        return value
+        Accessors are shared per key, so the default and type of the first
+        request for a key apply.
+        """
+        accessor = self._accessors.get(key)
+        if accessor is None:
+            accessor = self._accessors[key] = ConfigValue(key, default, type)
+            accessor.refresh(self._flat)
+        return accessor
     
     def set(self, key, value):
         """Set configuration value by dot-notation key"""
@@ -65,13 +219,80 @@ class ConfigManager:
         
         # Set the value
         current[keys[-1]] = value
+        self._notify(self._rebuild())
+    
+    def _write(self, text):
+        """Write the file atomically: temp file, fsync, then rename over the original"""
+        directory = os.path.dirname(self.config_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = f"{self.config_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_path)
+        except OSError:
+            # The original file is untouched; don't leave the half-written copy behind
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        # Make the rename itself durable where the platform allows it
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return self._stat()
     
     def save(self):
-        """Save configuration to file"""
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        """Save configuration to file
         
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        Inside the event loop, saves are debounced so a burst of set() and
+        save() calls becomes one write, which runs off the loop. Await
+        flush() to make sure pending changes are on disk.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._last_stat = self._write(json.dumps(self.config, indent=4))
+            logger.info(f"Configuration saved to {self.config_path}")
+            return
         
-        logger.info(f"Configuration saved to {self.config_path}")
+        # Push the write back on each call, but never past max_save_delay
+        now = loop.time()
+        if self._save_due is None:
+            self._save_due = now + self.max_save_delay
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_at(min(now + self.save_delay, self._save_due), self._start_save)
+    
+    def _start_save(self):
+        self._save_handle = None
+        self._save_due = None
+        self._save_task = asyncio.create_task(self._save())
+    
+    async def _save(self):
+        async with self._save_lock:
+            # Serialized on the loop so the thread never sees a config mid-change
+            text = json.dumps(self.config, indent=4)
+            self._saving = True
+            try:
+                self._last_stat = await asyncio.to_thread(self._write, text)
+                logger.info(f"Configuration saved to {self.config_path}")
+            except OSError as e:
+                logger.error(f"Could not save configuration to {self.config_path}: {e}")
+            finally:
+                self._saving = False
+    
+    async def flush(self):
+        """Write any debounced save now and wait for it to finish"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._start_save()
+        if self._save_task is not None:
+            await self._save_task
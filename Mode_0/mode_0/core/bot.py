@@ -3,12 +3,16 @@ Core bot implementation for Mode_0.
 """
 import asyncio
 import logging
+import random
+from datetime import datetime
 from twitchio.ext import commands
 from mode_0.config.config_manager import ConfigManager
 from mode_0.database.db_manager import DatabaseManager
 from mode_0.persona.persona_system import PersonaSystem
 from mode_0.streamelements.se_manager import StreamElementsManager
+from mode_0.streamelements.se_events import StreamElementsEvents
 from mode_0.utils.logger import setup_logger
+from mode_0.utils.helpers import get_random_delay
 
 logger = logging.getLogger("mode_0.core.bot")
 
@@ -23,11 +27,17 @@ class Mode0Bot(commands.Bot):
         # Load configuration
         self.config = ConfigManager()
         
+        # Settings read on hot paths are bound once and kept current by the config manager
+        self._command_prefix = self.config.accessor("bot.command_prefix", "!", str)
+        self._auto_engage = self.config.accessor("bot.auto_engage", True, bool)
+        self._channel_name = self.config.accessor("twitch.channel")
+        self._flush_interval = self.config.accessor("database.flush_interval", 10, float)
+        
         # Initialize bot with Twitch credentials
         super().__init__(
             token=self.config.get("twitch.oauth_token"),
-            prefix=self.config.get("bot.command_prefix", "!"),
-            initial_channels=[self.config.get("twitch.channel")]
+            prefix=lambda bot, message: self._command_prefix.value,
+            initial_channels=[self._channel_name.value]
         )
         
         # Set up database
@@ -39,8 +49,28 @@ class Mode0Bot(commands.Bot):
         # Initialize StreamElements manager
         self.se_manager = StreamElementsManager(
             jwt_token=self.config.get("streamelements.jwt"),
-            channel_id=self.config.get("streamelements.channel_id")
+            channel_id=self.config.get("streamelements.channel_id"),
+            catalog_path=self.config.get("streamelements.catalog_path", "data/se_catalog.json"),
+            catalog_ttl=self.config.get("streamelements.catalog_ttl", 3600),
+            games=self.config.get("streamelements.games"),
+            loyalty=self.config.get("streamelements.loyalty"),
+            rate_limit=self.config.get("streamelements.rate_limit"),
+            base_url=self.config.get("streamelements.base_url", "https://api.streamelements.com/kappa/v2"),
+            ws_url=self.config.get("streamelements.ws_url", "wss://realtime.streamelements.com/socket.io")
+        )
+        self.se_events = StreamElementsEvents(
+            self,
+            dedup_path=self.config.get("streamelements.dedup_path", "data/se_seen_events.json"),
+            alerts=self.config.get("streamelements.alerts"),
+            jobs_path=self.config.get("streamelements.jobs_path", "data/se_jobs.db"),
+            jobs=self.config.get("streamelements.jobs")
         )
+        self.se_manager.event_handler = self.se_events.handle_event
+        
+        # Apply config edits without restarting the bot
+        self.persona_config = ConfigManager("mode_0/config/persona_config.json")
+        self.persona_config.subscribe("", lambda changes: self.persona.reload_config(self.persona_config.config))
+        self.config.subscribe("streamelements", self._on_streamelements_config)
         
         # Bot state
         self.message_queue = asyncio.Queue()
@@ -52,20 +82,58 @@ class Mode0Bot(commands.Bot):
         # Start processing tasks
         self.loop.create_task(self._process_message_queue())
         self.loop.create_task(self._idle_chat_initiator())
+        self.loop.create_task(self._greeting_flusher())
+        self.loop.create_task(self._persona_ticker())
+        self.loop.create_task(self._persona_flusher())
+        self.loop.create_task(self.persona.summaries.run())
+        self.loop.create_task(self._se_state_saver())
+        self.loop.create_task(self.se_events.jobs.start())
+        self.loop.create_task(self.config.watch())
+        self.loop.create_task(self.persona_config.watch())
     
     def _register_commands(self):
         """Register command modules"""
         # To be implemented - register command cogs here
         pass
     
+    def _on_streamelements_config(self, changes):
+        """Push changed StreamElements settings to the running manager"""
+        sections = {key.split(".")[1] for key in changes if key.count(".") >= 1}
+        self.se_manager.configure(**{
+            section: self.config.get(f"streamelements.{section}", {})
+            for section in ("games", "loyalty", "rate_limit")
+            if section in sections
+        })
+    
     async def event_ready(self):
         """Called once when bot connects to Twitch"""
         logger.info(f"Bot connected to Twitch | {self.nick}")
+        self.persona.bot_name = self.nick.lower()
         logger.info(f"Connected to channels: {', '.join(self.initial_channels)}")
         
         # Connect to StreamElements
         await self.se_manager.connect()
     
+    async def close(self):
+        """Release StreamElements connections and write batched data before shutting down"""
+        # Profile changes and conversations are only written in batches, so write the last one
+        try:
+            self.persona.conversations.close_all()
+            await self.persona.flush()
+        except Exception as e:
+            logger.error(f"Error flushing persona data on shutdown: {e}")
+        await self.persona.summaries.close()
+        
+        await self.se_manager.close()
+        # Give events already queued a chance to be handled before the workers stop
+        if not await self.se_events.dispatcher.drain(timeout=5):
+            logger.warning(f"Stopping with unhandled StreamElements events: {self.se_events.dispatcher.stats()}")
+        await self.se_events.dispatcher.stop()
+        await self.se_events.jobs.stop()
+        await self.se_events.save_state()
+        await self.config.flush()
+        await super().close()
+    
     async def event_message(self, message):
         """Event handler for incoming messages"""
         # Ignore messages from the bot itself
@@ -84,8 +152,22 @@ class Mode0Bot(commands.Bot):
         while True:
             message = await self.message_queue.get()
             try:
-                # Implementation to be added
-                pass
+                author = message.author
+                
+                self.active_chatters[author.id] = datetime.now()
+                
+                # Greetings are de-duplicated and coalesced so a raid only costs a few messages
+                self.persona.queue_greeting(author.display_name or author.name, author.id)
+                
+                # Profile changes are merged in memory and flushed in batches
+                await self.persona.parse_and_update_profile(message, author.id)
+                self.persona.track_conversation(message, author.id)
+                
+                # Update channel mood, then a cheap scoring pass; most messages stop here
+                is_mentioned = self.persona.is_mentioned(message.content)
+                topics = self.persona.observe_message(message, is_mentioned)
+                if self.persona.should_engage(message, is_mentioned, topics) is not None:
+                    self.loop.create_task(self._reply(message, is_mentioned))
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
             finally:
@@ -93,5 +175,82 @@ class Mode0Bot(commands.Bot):
     
     async def _idle_chat_initiator(self):
         """Initiate conversation when chat is quiet"""
-        # Implementation to be added
-        pass
+        interval = self.persona.config.get("engagement", {}).get("idle_chat_interval", {})
+        while True:
+            await asyncio.sleep(60 * random.uniform(
+                interval.get("min_minutes", 5), interval.get("max_minutes", 15)
+            ))
+            if not self._auto_engage.value:
+                continue
+            
+            # Don't talk over a chat that is already busy
+            mood = self.persona.mood
+            if mood == "hype":
+                continue
+            try:
+                await self.send_chat(await self.persona.get_conversation_starter(mood))
+                self.persona.note_bot_message()
+            except Exception as e:
+                logger.error(f"Error sending conversation starter: {e}")
+    
+    async def _greeting_flusher(self):
+        """Send coalesced greetings at a bounded rate"""
+        while True:
+            # Read every time so reloaded greeting settings apply straight away
+            greetings = self.persona.greetings
+            await asyncio.sleep(greetings.window / max(1, greetings.max_messages_per_window))
+            try:
+                for greeting in await self.persona.flush_greetings():
+                    await self.send_chat(greeting)
+            except Exception as e:
+                logger.error(f"Error sending greetings: {e}")
+    
+    async def _persona_ticker(self):
+        """Apply batched persona feedback at a fixed interval"""
+        while True:
+            await asyncio.sleep(self.persona.config.get("adaptation", {}).get("tick_seconds", 60))
+            try:
+                self.persona.tick()
+            except Exception as e:
+                logger.error(f"Error updating persona: {e}")
+    
+    async def _persona_flusher(self):
+        """Write batched user profile changes and finished conversations"""
+        while True:
+            await asyncio.sleep(self._flush_interval.value)
+            try:
+                await self.persona.flush()
+            except Exception as e:
+                logger.error(f"Error flushing persona data: {e}")
+    
+    async def _se_state_saver(self):
+        """Periodically persist StreamElements event de-duplication state"""
+        while True:
+            await asyncio.sleep(60)
+            try:
+                await self.se_events.save_state()
+            except Exception as e:
+                logger.error(f"Error saving StreamElements state: {e}")
+            
+            limiter = self.se_manager.limiter
+            if limiter.utilization() >= limiter.shed_threshold:
+                logger.warning(f"StreamElements API quota running low: {limiter.report()}")
+    
+    async def _reply(self, message, is_mentioned=False):
+        """Send a reply after a human-like delay"""
+        timing = self.persona.config.get("response_timing", {})
+        await asyncio.sleep(get_random_delay(timing.get("min_delay", 1), timing.get("max_delay", 3)))
+        try:
+            response = await self.persona.generate_response(message, is_mentioned=is_mentioned)
+            await message.channel.send(response)
+            self.persona.note_bot_message()
+        except Exception as e:
+            logger.error(f"Error sending reply: {e}")
+    
+    async def send_chat(self, text):
+        """Send a message to the bot's channel"""
+        channel = self.get_channel(self._channel_name.value)
+        if channel is None:
+            logger.warning("Cannot send message, channel not joined")
+            return
+        await channel.send(text)
@@ -73,25 +73,53 @@ class DatabaseManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Check if user exists
-        cursor.execute('SELECT * FROM users WHERE user_id = ?', (user_id,))
-        user = cursor.fetchone()
-        
         now = datetime.now()
         
-        if user:
-            # Update existing user
-            cursor.execute('''
-            UPDATE users 
-            SET username = ?, display_name = ?, last_seen = ?, message_count = message_count + 1
-            WHERE user_id = ?
-            ''', (username, display_name, now, user_id))
-        else:
-            # Add new user
-            cursor.execute('''
-            INSERT INTO users (user_id, username, display_name, first_seen, last_seen, message_count, profile)
-            VALUES (?, ?, ?, ?, ?, 1, '{}')
-            ''', (user_id, username, display_name, now, now))
+        # Single upsert instead of a lookup followed by an insert or update
+        cursor.execute('''
+        INSERT INTO users (user_id, username, display_name, first_seen, last_seen, message_count, profile)
+        VALUES (?, ?, ?, ?, ?, 1, '{}')
+        ON CONFLICT(user_id) DO UPDATE
+        SET username = excluded.username, display_name = excluded.display_name,
+            last_seen = excluded.last_seen, message_count = message_count + 1
+        ''', (user_id, username, display_name, now, now))
+        
+        conn.commit()
+        conn.close()
+    
+    async def apply_user_deltas(self, deltas):
+        """Apply batched per-user changes in one transaction
+        
+        Each delta carries a message count increment and a patch of changed
+        profile fields, which is merged into the stored JSON by SQLite rather
+        than re-serializing the whole profile.
+        """
+        rows = []
+        for user_id, delta in deltas.items():
+            last_seen = delta.get("last_seen") or datetime.now()
+            rows.append((
+                user_id,
+                delta.get("username"),
+                delta.get("display_name"),
+                last_seen,
+                last_seen,
+                delta.get("messages", 0),
+                json.dumps(delta.get("profile", {}))
+            ))
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+        INSERT INTO users (user_id, username, display_name, first_seen, last_seen, message_count, profile)
+        VALUES (?, ?, ?, ?, ?, ?, json_patch('{}', ?))
+        ON CONFLICT(user_id) DO UPDATE
+        SET username = COALESCE(excluded.username, users.username),
+            display_name = COALESCE(excluded.display_name, users.display_name),
+            last_seen = excluded.last_seen,
+            message_count = users.message_count + excluded.message_count,
+            profile = json_patch(COALESCE(users.profile, '{}'), excluded.profile)
+        ''', rows)
         
         conn.commit()
         conn.close()
@@ -109,6 +137,37 @@ class DatabaseManager:
         conn.commit()
         conn.close()
     
+    async def add_conversations(self, conversations):
+        """Store finished conversations in one transaction, returning their ids"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        ids = []
+        for conversation in conversations:
+            cursor.execute('''
+            INSERT INTO conversations (start_time, end_time, user_id, summary)
+            VALUES (?, ?, ?, ?)
+            ''', (conversation.start_time, conversation.end_time, conversation.user_id, conversation.summary))
+            ids.append(cursor.lastrowid)
+        
+        conn.commit()
+        conn.close()
+        return ids
+    
+    async def update_conversation_summaries(self, summaries):
+        """Store (conversation_id, summary) pairs"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+        UPDATE conversations
+        SET summary = ?
+        WHERE id = ?
+        ''', [(summary, conversation_id) for conversation_id, summary in summaries])
+        
+        conn.commit()
+        conn.close()
+    
     async def get_user_profile(self, user_id):
         """Get user profile data"""
         conn = sqlite3.connect(self.db_path)
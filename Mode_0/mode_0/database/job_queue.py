@@ -0,0 +1,240 @@
+"""
+Durable SQLite-backed job queue.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from mode_0.database.models import Job
+
+logger = logging.getLogger("mode_0.database.jobs")
+
+
+class JobQueue:
+    """At-least-once job queue that survives restarts
+
+    enqueue() only appends to an in-memory buffer, so callers on the event
+    loop never wait on disk. A writer task persists buffered jobs and status
+    changes in batched transactions off the loop, and only hands a job to
+    the workers once it is on disk. Jobs are marked done after their
+    handler succeeds; anything unfinished at shutdown or after a crash is
+    picked up again on the next start, so handlers must tolerate repeats.
+    Failed jobs are retried with exponential backoff up to max_attempts.
+    """
+
+    def __init__(self, path, handler, workers=2, max_attempts=5, backoff_base=2.0,
+                 backoff_cap=300.0, flush_interval=0.05, retention=86400):
+        self.path = path
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.flush_interval = flush_interval
+        self.retention = retention
+
+        self._conn = None
+        self._new = []
+        self._updates = []
+        self._ready = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+        self._timers = {}
+        self._write_lock = threading.Lock()
+        self._running = False
+
+        # Metrics
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Used by one writer thread at a time, never concurrently
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT,
+            payload TEXT,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            run_at REAL,
+            last_error TEXT,
+            updated_at REAL
+        )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+        conn.commit()
+        return conn
+
+    def _load_pending(self):
+        """Open the database, prune old jobs and return everything unfinished"""
+        self._conn = self._connect()
+        self._conn.execute(
+            "DELETE FROM jobs WHERE status != 'pending' AND updated_at < ?",
+            (time.time() - self.retention,)
+        )
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT id, kind, payload, attempts, run_at FROM jobs WHERE status = 'pending' ORDER BY run_at"
+        ).fetchall()
+        return [Job(job_id, kind, json.loads(payload), attempts, run_at)
+                for job_id, kind, payload, attempts, run_at in rows]
+
+    async def start(self):
+        """Recover unfinished jobs and start the writer and workers"""
+        if self._running:
+            return
+        pending = await asyncio.to_thread(self._load_pending)
+        self._running = True
+        for job in pending:
+            self._schedule(job)
+        if pending:
+            logger.info(f"Recovered {len(pending)} unfinished job(s) from {self.path}")
+
+        self._tasks.append(asyncio.create_task(self._writer()))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    def enqueue(self, kind, payload, job_id):
+        """Queue a job without touching disk; job_id makes repeats idempotent"""
+        self._new.append(Job(str(job_id), kind, payload, 0, time.time()))
+        self.enqueued += 1
+        self._wakeup.set()
+
+    def _schedule(self, job):
+        """Hand a persisted job to the workers once it is due"""
+        delay = job.run_at - time.time()
+        if delay <= 0:
+            self._ready.put_nowait(job)
+            return
+        self._timers[job.id] = asyncio.get_running_loop().call_later(delay, self._release, job)
+
+    def _release(self, job):
+        self._timers.pop(job.id, None)
+        self._ready.put_nowait(job)
+
+    def _write(self, new, updates):
+        """Persist a batch of new jobs and status changes in one transaction
+
+        Returns the new jobs that were actually inserted, so ids that are
+        already queued or done aren't run twice.
+        """
+        inserted = []
+        now = time.time()
+        # A write cancelled on the loop side may still be finishing in its thread
+        with self._write_lock, self._conn:
+            for job in new:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs (id, kind, payload, attempts, run_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, job.kind, json.dumps(job.payload), job.attempts, job.run_at, now)
+                )
+                if cursor.rowcount:
+                    inserted.append(job)
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, attempts = ?, run_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                [(status, job.attempts, job.run_at, error, now, job.id) for job, status, error in updates]
+            )
+        return inserted
+
+    async def _flush(self):
+        """Write whatever is buffered and release newly persisted jobs"""
+        if not self._new and not self._updates:
+            return
+        new, self._new = self._new, []
+        updates, self._updates = self._updates, []
+        try:
+            inserted = await asyncio.to_thread(self._write, new, updates)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing job queue: {e}")
+            # Keep the batch and try again on the next flush
+            self._new = new + self._new
+            self._updates = updates + self._updates
+            await asyncio.sleep(1)
+            return
+        for job in inserted:
+            self._schedule(job)
+
+    async def _writer(self):
+        """Batch writes: wait for work, then give the buffer a moment to fill"""
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _worker(self):
+        while True:
+            job = await self._ready.get()
+            try:
+                await self.handler(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed(job, e)
+            else:
+                self.completed += 1
+                self._updates.append((job, "done", None))
+            self._wakeup.set()
+
+    def _failed(self, job, error):
+        """Schedule a retry with backoff, or give up after max_attempts"""
+        job.attempts += 1
+        if job.attempts >= self.max_attempts:
+            self.failed += 1
+            logger.error(f"Job {job.kind}:{job.id} failed permanently after {job.attempts} attempts: {error}")
+            self._updates.append((job, "failed", str(error)))
+            return
+
+        self.retried += 1
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** job.attempts))
+        job.run_at = time.time() + delay
+        logger.warning(f"Job {job.kind}:{job.id} failed ({error}), retrying in {delay:.1f}s")
+        self._updates.append((job, "pending", str(error)))
+        self._schedule(job)
+
+    async def stop(self):
+        """Stop the workers and flush buffered writes
+
+        Jobs still waiting or interrupted mid-run stay pending on disk and
+        run again on the next start.
+        """
+        if not self._running:
+            return
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await self._flush()
+        await asyncio.to_thread(self._close)
+
+    def _close(self):
+        with self._write_lock:
+            self._conn.close()
+
+    def stats(self):
+        """Queue counters for logging"""
+        return {
+            "buffered": len(self._new),
+            "ready": self._ready.qsize(),
+            "delayed": len(self._timers),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
@@ -34,3 +34,12 @@ class Conversation:
     user_id: str
     summary: Optional[str]
     messages: List[Message] = None
+
+@dataclass
+class Job:
+    """Durable background job"""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int = 0
+    run_at: float = 0.0
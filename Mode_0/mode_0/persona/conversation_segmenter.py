@@ -0,0 +1,122 @@
+"""
+Conversation segmentation for the Mode_0 bot.
+"""
+import heapq
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from mode_0.database.models import Conversation, Message
+
+logger = logging.getLogger("mode_0.persona.conversations")
+
+
+class ConversationSegmenter:
+    """Groups each user's messages into conversations as they stream in
+
+    Open conversations live in a dict keyed by user, with their timeouts in a
+    min-heap. Stale heap entries are skipped lazily, so each message costs
+    O(log n) in the number of open conversations and the messages table is
+    never re-read.
+    """
+
+    def __init__(self, db_manager, inactivity_gap=300, reply_gap=900,
+                 max_messages=200, max_tracked_replies=5000):
+        self.db = db_manager
+        self.configure(inactivity_gap, reply_gap, max_messages, max_tracked_replies)
+
+        self.open = {}
+        self._timeouts = []
+        self._deadline = {}
+        self._finished = []
+
+        # Recent message ids, so replies can be threaded into their conversation
+        self._message_owner = OrderedDict()
+
+    def configure(self, inactivity_gap=300, reply_gap=900, max_messages=200, max_tracked_replies=5000):
+        """Apply segmentation settings; open conversations keep their current timeouts"""
+        self.inactivity_gap = timedelta(seconds=inactivity_gap)
+        self.reply_gap = timedelta(seconds=reply_gap)
+        self.max_messages = max_messages
+        self.max_tracked_replies = max_tracked_replies
+
+    def add_message(self, user_id, content, channel, timestamp=None,
+                    message_id=None, reply_to=None):
+        """Add a chat message to its user's open conversation"""
+        timestamp = timestamp or datetime.now()
+        self.expire(timestamp)
+
+        # Replies to a recent message keep a conversation open for longer
+        gap = self.reply_gap if reply_to in self._message_owner else self.inactivity_gap
+
+        conversation = self.open.get(user_id)
+        if conversation is not None and (
+            timestamp - conversation.end_time > gap
+            or len(conversation.messages) >= self.max_messages
+        ):
+            self._close(user_id)
+            conversation = None
+
+        if conversation is None:
+            conversation = Conversation(
+                id=None,
+                start_time=timestamp,
+                end_time=timestamp,
+                user_id=user_id,
+                summary=None,
+                messages=[]
+            )
+            self.open[user_id] = conversation
+
+        conversation.messages.append(Message(
+            id=None, user_id=user_id, content=content, channel=channel, timestamp=timestamp
+        ))
+        conversation.end_time = timestamp
+
+        deadline = (timestamp + gap).timestamp()
+        self._deadline[user_id] = deadline
+        heapq.heappush(self._timeouts, (deadline, user_id))
+
+        if message_id is not None:
+            self._message_owner[message_id] = user_id
+            if len(self._message_owner) > self.max_tracked_replies:
+                self._message_owner.popitem(last=False)
+        return conversation
+
+    def _close(self, user_id):
+        """Move a user's open conversation to the finished list"""
+        conversation = self.open.pop(user_id, None)
+        self._deadline.pop(user_id, None)
+        if conversation is not None:
+            self._finished.append(conversation)
+
+    def expire(self, now=None):
+        """Close conversations whose timeout has passed"""
+        now = (now or datetime.now()).timestamp()
+        while self._timeouts and self._timeouts[0][0] <= now:
+            deadline, user_id = heapq.heappop(self._timeouts)
+            # Entries superseded by a later message are skipped
+            if self._deadline.get(user_id) == deadline:
+                self._close(user_id)
+
+    def close_all(self):
+        """Close every open conversation, e.g. on shutdown"""
+        for user_id in list(self.open):
+            self._close(user_id)
+        self._timeouts.clear()
+
+    async def flush(self, now=None):
+        """Write finished conversations in one batch, returning them with their ids"""
+        self.expire(now)
+        if not self._finished:
+            return []
+
+        finished, self._finished = self._finished, []
+        try:
+            ids = await self.db.add_conversations(finished)
+        except Exception:
+            self._finished = finished + self._finished
+            raise
+        for conversation, conversation_id in zip(finished, ids):
+            conversation.id = conversation_id
+        logger.debug(f"Stored {len(finished)} conversation(s)")
+        return finished
@@ -0,0 +1,138 @@
+"""
+Engagement decisions for the Mode_0 bot.
+"""
+import logging
+import math
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger("mode_0.persona.engagement")
+
+QUESTION_WORDS = frozenset({
+    "who", "what", "when", "where", "why", "how", "which",
+    "is", "are", "do", "does", "did", "can", "could", "will", "would", "should"
+})
+
+
+class RateMeter:
+    """Exponentially-decayed event rate, in events per second"""
+
+    def __init__(self, time_constant=60.0):
+        self.time_constant = time_constant
+        self._rate = 0.0
+        self._updated = None
+
+    def rate(self, now=None):
+        """Current rate with decay applied up to now"""
+        now = time.monotonic() if now is None else now
+        if self._updated is None:
+            return 0.0
+        return self._rate * math.exp(-(now - self._updated) / self.time_constant)
+
+    def observe(self, now=None, count=1):
+        """Record count events at time now"""
+        now = time.monotonic() if now is None else now
+        self._rate = self.rate(now) + count / self.time_constant
+        self._updated = now
+
+
+class SlidingWindow:
+    """Exact count of events within the last window seconds"""
+
+    def __init__(self, window=60.0):
+        self.window = window
+        self._events = deque()
+
+    def count(self, now=None):
+        """Events still inside the window at time now"""
+        now = time.monotonic() if now is None else now
+        while self._events and self._events[0] <= now - self.window:
+            self._events.popleft()
+        return len(self._events)
+
+    def add(self, now=None):
+        self._events.append(time.monotonic() if now is None else now)
+
+
+def is_question(text):
+    """Cheap check for whether a message is asking something"""
+    stripped = text.rstrip()
+    if stripped.endswith("?"):
+        return True
+    first_word = stripped.split(" ", 1)[0].lower()
+    return first_word in QUESTION_WORDS and len(stripped) > len(first_word)
+
+
+class EngagementEngine:
+    """Decides per message whether the bot should reply
+
+    Every message costs a constant amount of bookkeeping. The reply budget is
+    checked before any text analysis, so during a flood most messages are
+    discarded after a couple of float operations. The decayed reply rate
+    scales replies with channel activity; a sliding window of actual replies
+    enforces max_replies_per_minute as a hard ceiling.
+    """
+
+    def __init__(self, config, topic_matcher):
+        self.messages = RateMeter()
+        self.replies = RateMeter()
+        self.recent_replies = SlidingWindow(60.0)
+        self.configure(config, topic_matcher)
+
+    def configure(self, config, topic_matcher):
+        """Apply engagement settings from the persona config"""
+        self.topic_matcher = topic_matcher
+        self.mention_rate = config.get("mention_response_rate", 1.0)
+        self.question_rate = config.get("direct_question_rate", 0.9)
+        self.general_rate = config.get("general_chat_rate", 0.3)
+        self.topic_boost = config.get("topic_boost", 0.5)
+        self.max_reply_share = config.get("max_reply_share", 0.1)
+        self.min_replies_per_minute = config.get("min_replies_per_minute", 1)
+        self.max_replies_per_minute = config.get("max_replies_per_minute", 6)
+
+    def reply_budget(self, now=None):
+        """Replies per second allowed at the current channel activity"""
+        allowed = self.max_reply_share * self.messages.rate(now)
+        floor = self.min_replies_per_minute / 60
+        ceiling = self.max_replies_per_minute / 60
+        return min(max(allowed, floor), ceiling)
+
+    def decide(self, text, is_mentioned=False, topics=None, now=None):
+        """Decide whether to reply to a message
+
+        Returns the kind of reply to send ("mention", "question" or "chat"),
+        or None if the message should be left alone.
+        """
+        now = time.monotonic() if now is None else now
+        self.messages.observe(now)
+
+        # Mentions may exceed the activity share, but nothing exceeds the hard ceiling
+        if self.recent_replies.count(now) >= self.max_replies_per_minute:
+            return None
+
+        if is_mentioned:
+            kind = "question" if is_question(text) else "mention"
+            # A question addressed by name is never less likely to get a reply than a bare mention
+            probability = max(self.mention_rate, self.question_rate)
+        else:
+            if self.replies.rate(now) >= self.reply_budget(now):
+                return None
+            kind = "question" if is_question(text) else "chat"
+            probability = self.general_rate
+
+            # Boost messages that touch on the channel's favourite topics
+            if topics is None:
+                topics = self.topic_matcher.scan(text)
+            boosts = len(topics.get("engagement_boost", ()))
+            if boosts:
+                probability *= 1 + self.topic_boost * boosts
+            elif topics.get("preferred"):
+                probability *= 1 + self.topic_boost / 2
+
+        if random.random() >= probability:
+            return None
+
+        self.replies.observe(now)
+        self.recent_replies.add(now)
+        return kind
@@ -0,0 +1,171 @@
+"""
+Greeting de-duplication and join-burst coalescing for the Mode_0 bot.
+"""
+import logging
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger("mode_0.persona.greetings")
+
+# Twitch rejects chat messages longer than this
+MAX_CHAT_LENGTH = 500
+
+
+class ExpiringSet:
+    """Set of keys that expire a fixed time after they were last added
+
+    Entries are kept in insertion order, so with a constant TTL the oldest
+    entry is always at the front and expiry is amortised O(1).
+    """
+
+    def __init__(self, ttl, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._expiry = OrderedDict()
+
+    def _expire(self, now):
+        """Drop entries whose TTL has elapsed"""
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._expiry.popitem(last=False)
+
+    def add(self, key, now=None):
+        """Add key, refreshing its expiry if already present"""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        self._expiry[key] = now + self.ttl
+        self._expiry.move_to_end(key)
+
+        # Evict oldest entries once the cap is reached
+        while len(self._expiry) > self.max_size:
+            self._expiry.popitem(last=False)
+
+    def contains(self, key, now=None):
+        """Check whether key was added within the TTL"""
+        now = time.monotonic() if now is None else now
+        expires_at = self._expiry.get(key)
+        return expires_at is not None and expires_at > now
+
+    def __len__(self):
+        return len(self._expiry)
+
+
+class GreetingCoalescer:
+    """Batches pending greetings so join bursts produce a bounded number of messages"""
+
+    def __init__(self, persona, greet_ttl=3600, window=30, max_messages_per_window=3,
+                 max_names_per_message=10, max_pending=500):
+        self.persona = persona
+
+        # Users greeted recently, and those waiting for the next flush
+        self.greeted = ExpiringSet(greet_ttl)
+        self.configure(greet_ttl, window, max_messages_per_window, max_names_per_message, max_pending)
+        self.pending = deque()
+        self._pending_ids = set()
+        self.overflow = 0
+
+        # Messages sent in the current throughput window
+        self._window_start = 0.0
+        self._window_sent = 0
+
+    def configure(self, greet_ttl=3600, window=30, max_messages_per_window=3,
+                  max_names_per_message=10, max_pending=500):
+        """Apply greeting settings; users already greeted keep their current expiry"""
+        self.greeted.ttl = greet_ttl
+        self.window = window
+        self.max_messages_per_window = max_messages_per_window
+        self.max_names_per_message = max_names_per_message
+        self.max_pending = max_pending
+
+    def add(self, user_id, username, now=None):
+        """Queue a user for greeting, returning False if they were skipped"""
+        now = time.monotonic() if now is None else now
+        known = user_id in self._pending_ids or self.greeted.contains(user_id, now)
+
+        # Every message pushes the expiry back, so a re-greet means they were actually away
+        self.greeted.add(user_id, now)
+        if known:
+            return False
+
+        if len(self.pending) >= self.max_pending:
+            # Too many to name individually; they are counted in the summary
+            self.overflow += 1
+            return True
+
+        self.pending.append((user_id, username))
+        self._pending_ids.add(user_id)
+        return True
+
+    def has_pending(self):
+        """Check whether any greetings are waiting to be sent"""
+        return bool(self.pending) or self.overflow > 0
+
+    def _remaining_budget(self, now):
+        """Number of greeting messages still allowed in the current window"""
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._window_sent = 0
+        return self.max_messages_per_window - self._window_sent
+
+    def _take(self, count):
+        """Remove up to count pending users from the front of the queue"""
+        batch = []
+        while self.pending and len(batch) < count:
+            user_id, username = self.pending.popleft()
+            self._pending_ids.discard(user_id)
+            batch.append((user_id, username))
+        return batch
+
+    def _format_group(self, usernames, extra=0):
+        """Build a single combined greeting for several users"""
+        if not usernames:
+            return self.persona.get_group_greeting(f"all {extra} of you")
+
+        names = ", ".join(f"@{name}" for name in usernames)
+        if extra:
+            names = f"{names} and {extra} other{'s' if extra != 1 else ''}"
+        message = self.persona.get_group_greeting(names)
+
+        # Trim names until the message fits in one chat line
+        while len(message) > MAX_CHAT_LENGTH and len(usernames) > 1:
+            extra += 1
+            usernames = usernames[:-1]
+            names = ", ".join(f"@{name}" for name in usernames)
+            names = f"{names} and {extra} other{'s' if extra != 1 else ''}"
+            message = self.persona.get_group_greeting(names)
+        return message
+
+    async def flush(self, now=None):
+        """Build the greeting messages allowed in this window"""
+        now = time.monotonic() if now is None else now
+        budget = self._remaining_budget(now)
+        messages = []
+
+        while budget > 0 and self.has_pending():
+            # A lone user still gets a personalised greeting
+            if len(self.pending) == 1 and not self.overflow:
+                user_id, username = self._take(1)[0]
+                messages.append(await self.persona.generate_greeting(username, user_id))
+            else:
+                batch = self._take(self.max_names_per_message)
+                extra = 0
+
+                # The last message allowed this window absorbs everyone left
+                if budget == 1:
+                    extra = len(self.pending) + self.overflow
+                    self.pending.clear()
+                    self._pending_ids.clear()
+                    self.overflow = 0
+                elif not self.pending:
+                    extra = self.overflow
+                    self.overflow = 0
+
+                messages.append(self._format_group([name for _, name in batch], extra))
+            budget -= 1
+            self._window_sent += 1
+
+        if messages:
+            logger.debug(f"Flushed {len(messages)} greeting message(s)")
+        return messages
@@ -0,0 +1,98 @@
+"""
+Incremental per-user interest extraction for the Mode_0 bot.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from mode_0.persona.topic_tracker import CountMinSketch
+
+logger = logging.getLogger("mode_0.persona.interests")
+
+# Rescale stored weights before the growth factor loses float precision
+_RESCALE_LIMIT = 1e12
+
+
+class InterestExtractor:
+    """Ranks each user's interests by decayed TF-IDF
+
+    Each user keeps a small decayed term-frequency vector and all users share
+    one document-frequency sketch. Rather than decaying every stored weight,
+    new weights are scaled up by the time elapsed since a fixed epoch, which
+    keeps an update O(tokens) in the message.
+    """
+
+    def __init__(self, half_life=7 * 86400, max_terms=50, max_users=5000,
+                 top_n=5, df_width=4096, df_depth=4):
+        self.decay = math.log(2) / half_life
+        self.max_terms = max_terms
+        self.max_users = max_users
+        self.top_n = top_n
+        self.document_frequency = CountMinSketch(df_width, df_depth)
+        self.documents = 0
+        self._epoch = None
+        self._users = OrderedDict()
+
+    def _weight(self, now):
+        """Weight of one occurrence at time now, relative to the epoch"""
+        if self._epoch is None:
+            self._epoch = now
+        scale = math.exp(self.decay * (now - self._epoch))
+        if scale > _RESCALE_LIMIT:
+            self._rescale(now)
+            scale = 1.0
+        return scale
+
+    def _rescale(self, now):
+        """Move the epoch to now, shrinking all stored weights to match"""
+        factor = math.exp(-self.decay * (now - self._epoch))
+        for terms in self._users.values():
+            for term in terms:
+                terms[term] *= factor
+        self._epoch = now
+        logger.debug("Rescaled interest weights")
+
+    def __contains__(self, user_id):
+        return user_id in self._users
+
+    def update(self, user_id, terms, now=None):
+        """Fold one message's terms into the user's vector and the global statistics"""
+        if not terms:
+            return
+        now = time.time() if now is None else now
+
+        # Every message counts as one document for IDF
+        self.documents += 1
+        for term in set(terms):
+            self.document_frequency.add(term)
+
+        vector = self._users.get(user_id)
+        if vector is None:
+            vector = self._users[user_id] = {}
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+
+        weight = self._weight(now)
+        for term in terms:
+            vector[term] = vector.get(term, 0.0) + weight
+
+        # Prune in batches so the cost stays amortised O(1) per term
+        if len(vector) > 2 * self.max_terms:
+            keep = sorted(vector, key=vector.get, reverse=True)[:self.max_terms]
+            self._users[user_id] = {term: vector[term] for term in keep}
+
+    def top_interests(self, user_id, n=None):
+        """User's highest-ranked terms by TF-IDF"""
+        vector = self._users.get(user_id)
+        if not vector:
+            return []
+
+        documents = self.documents
+        scores = {
+            term: weight * math.log((1 + documents) / (1 + self.document_frequency.estimate(term)))
+            for term, weight in vector.items()
+        }
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [term for term in ranked[:n or self.top_n] if scores[term] > 0]
@@ -0,0 +1,126 @@
+"""
+Channel mood estimation for the Mode_0 bot.
+"""
+import logging
+import math
+import time
+
+logger = logging.getLogger("mode_0.persona.mood")
+
+# Conversation starter pool used for each mood
+STARTER_POOLS = {
+    "quiet": "quiet_starters",
+    "neutral": "conversation_starters",
+    "active": "active_starters",
+    "hype": "active_starters",
+    "gaming": "gaming_starters",
+}
+
+
+def count_emotes(message):
+    """Count emotes in a Twitch message using its IRC tags"""
+    tags = getattr(message, "tags", None) or {}
+    emotes = tags.get("emotes")
+    if not emotes:
+        return 0
+    # Format is "id:start-end,start-end/id:start-end"
+    return emotes.count(",") + emotes.count("/") + 1
+
+
+def caps_ratio(text):
+    """Fraction of letters in text that are uppercase"""
+    letters = upper = 0
+    for char in text:
+        if char.isalpha():
+            letters += 1
+            if char.isupper():
+                upper += 1
+    return upper / letters if letters else 0.0
+
+
+class MoodEstimator:
+    """Incremental channel mood from exponentially-decayed counters
+
+    Each counter decays with the same half-life, so updates and queries only
+    need the time since the last update - no history is kept or rescanned.
+    """
+
+    SIGNALS = ("messages", "emotes", "caps", "keywords", "gaming")
+
+    def __init__(self, half_life=120.0, quiet_rate=2.0, active_rate=10.0, hype_rate=25.0):
+        self._counters = dict.fromkeys(self.SIGNALS, 0.0)
+        self._updated = None
+        self.configure(half_life, quiet_rate, active_rate, hype_rate)
+
+    def configure(self, half_life=120.0, quiet_rate=2.0, active_rate=10.0, hype_rate=25.0):
+        """Apply mood settings, keeping the counters built up so far"""
+        if self._updated is not None:
+            # Settle the counters under the old half-life before switching
+            now = time.monotonic()
+            self._counters = self._decayed(now)
+            self._updated = now
+        self.decay = math.log(2) / half_life
+        self.quiet_rate = quiet_rate
+        self.active_rate = active_rate
+        self.hype_rate = hype_rate
+
+    def _decayed(self, now):
+        """Counters decayed to now, without modifying state"""
+        if self._updated is None:
+            return self._counters
+        factor = math.exp(-self.decay * (now - self._updated))
+        return {name: value * factor for name, value in self._counters.items()}
+
+    def observe(self, text, emotes=0, keyword_hits=0, gaming_hits=0, now=None):
+        """Fold one chat message into the counters"""
+        now = time.monotonic() if now is None else now
+        counters = self._decayed(now)
+        counters["messages"] += 1
+        counters["emotes"] += emotes
+        counters["caps"] += 1 if len(text) >= 4 and caps_ratio(text) > 0.6 else 0
+        counters["keywords"] += keyword_hits
+        counters["gaming"] += gaming_hits
+        self._counters = counters
+        self._updated = now
+
+    def message_rate(self, now=None):
+        """Decayed messages per minute"""
+        now = time.monotonic() if now is None else now
+        messages = self._decayed(now)["messages"]
+        # At a steady rate the decayed count settles at rate / decay
+        return messages * self.decay * 60
+
+    def energy(self, now=None):
+        """Channel energy between 0.0 (dead) and 1.0 (hype)"""
+        now = time.monotonic() if now is None else now
+        counters = self._decayed(now)
+        rate = counters["messages"] * self.decay * 60
+        if not counters["messages"]:
+            return 0.0
+
+        activity = min(rate / self.hype_rate, 1.0)
+        expressiveness = min(
+            (counters["emotes"] + 2 * counters["caps"] + counters["keywords"]) / counters["messages"] / 3,
+            1.0
+        )
+        return round(0.7 * activity + 0.3 * expressiveness, 3)
+
+    def mood(self, now=None):
+        """Current channel mood label"""
+        now = time.monotonic() if now is None else now
+        counters = self._decayed(now)
+        rate = counters["messages"] * self.decay * 60
+
+        if rate < self.quiet_rate:
+            return "quiet"
+        if counters["gaming"] >= 0.3 * counters["messages"]:
+            return "gaming"
+        if rate >= self.hype_rate or (rate >= self.active_rate and self.energy(now) >= 0.7):
+            return "hype"
+        if rate >= self.active_rate:
+            return "active"
+        return "neutral"
+
+    def starter_pool(self, mood=None, now=None):
+        """Name of the response list matching the given or current mood"""
+        return STARTER_POOLS.get(mood or self.mood(now), "conversation_starters")
@@ -4,7 +4,17 @@ Persona system for the Mode_0 bot.
 import json
 import random
 import logging
+import time
 from datetime import datetime, timedelta
+from mode_0.persona.greeting_coalescer import GreetingCoalescer
+from mode_0.persona.topic_matcher import TopicMatcher, chat_terms
+from mode_0.persona.topic_tracker import TopicTracker
+from mode_0.persona.user_profiler import UserProfiler
+from mode_0.persona.conversation_segmenter import ConversationSegmenter
+from mode_0.persona.summarizer import SummaryPipeline
+from mode_0.persona.engagement import EngagementEngine, is_question
+from mode_0.persona.mood import MoodEstimator, count_emotes
+from mode_0.persona.trait_adapter import TraitAdapter
 
 logger = logging.getLogger("mode_0.persona")
 
@@ -16,12 +26,7 @@ class PersonaSystem:
         logger.info("Initializing persona system")
         
         # Load persona configuration
-        try:
-            with open("mode_0/config/persona_config.json", "r") as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            logger.warning("Persona config not found, using defaults")
-            self.config = self._default_persona_config()
+        self.config = self._load_persona_config()
         
         # Load response templates
         try:
@@ -32,9 +37,112 @@ class PersonaSystem:
             self.responses = self._default_responses()
         
         # Persona state
-        self.mood = "neutral"  # neutral, happy, excited, calm, etc.
-        self.conversation_topics = {}
-        self.learning_rate = 0.05  # How quickly persona adapts
+        self.mood_engine = MoodEstimator(**self.config.get("mood", {}))
+        self.topic_tracker = TopicTracker(**self.config.get("topic_tracking", {}))
+        self.profiler = UserProfiler(self.db, self.topic_tracker)
+        self.conversations = ConversationSegmenter(self.db, **self.config.get("conversations", {}))
+        self.summaries = SummaryPipeline(self.db, **self.config.get("summaries", {}))
+        self.learning_rate = self.config.get("learning_rate", 0.05)  # How quickly persona adapts
+        self.traits = self._build_trait_adapter()
+        
+        # Feedback window opened by each bot message
+        self._feedback_until = 0.0
+        self._feedback_seen = True
+        
+        # Coalesces greetings so raids don't flood chat
+        self.greetings = GreetingCoalescer(self, **self._greeting_settings())
+        
+        # Matches preferred and engagement-boost topics in a single pass
+        self.topic_matcher = TopicMatcher.from_config(self.config.get("topics", {}))
+        
+        # Decides which chat messages deserve a reply
+        self.engagement = EngagementEngine(self.config.get("engagement", {}), self.topic_matcher)
+        self.bot_name = None
+    
+    @property
+    def mood(self):
+        """Current channel mood: quiet, neutral, active, hype or gaming"""
+        return self.mood_engine.mood()
+    
+    @property
+    def conversation_topics(self):
+        """Top chat topics over the tracking window, with approximate counts"""
+        return dict(self.topic_tracker.top())
+    
+    @property
+    def personality(self):
+        """Current adapted personality traits"""
+        return self.traits.as_dict()
+    
+    def _build_trait_adapter(self):
+        """Create the trait adapter from the persona config"""
+        adaptation = self.config.get("adaptation", {})
+        return TraitAdapter(
+            self.config.get("base_personality", self._default_persona_config()["base_personality"]),
+            learning_rate=self.learning_rate,
+            influence=adaptation.get("influence"),
+            reversion=adaptation.get("reversion", 0.1)
+        )
+    
+    def _load_persona_config(self):
+        """Load persona configuration from file"""
+        try:
+            with open("mode_0/config/persona_config.json", "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.warning("Persona config not found, using defaults")
+            return self._default_persona_config()
+    
+    def reload_config(self, config=None):
+        """Reload persona configuration and rebuild derived state
+        
+        config is an already loaded and validated configuration; without
+        one the file is read again.
+        """
+        previous_config = self.config
+        if config is not None:
+            self.config = config
+        else:
+            try:
+                self.config = self._load_persona_config()
+            except json.JSONDecodeError:
+                logger.error("Invalid JSON in persona config, keeping current settings")
+                return
+        
+        self.greetings.configure(**self._greeting_settings())
+        self.mood_engine.configure(**self.config.get("mood", {}))
+        self.conversations.configure(**self.config.get("conversations", {}))
+        
+        # Recent topic counts are sized by these settings, so only rebuild when they change
+        topic_tracking = self.config.get("topic_tracking", {})
+        if topic_tracking != previous_config.get("topic_tracking", {}):
+            self.topic_tracker = TopicTracker(**topic_tracking)
+            self.profiler.topic_tracker = self.topic_tracker
+        
+        # Worker processes and their limits are fixed once the pipeline starts
+        if self.config.get("summaries", {}) != previous_config.get("summaries", {}):
+            logger.warning("Changes to the summaries settings take effect after a restart")
+        
+        self.topic_matcher = TopicMatcher.from_config(self.config.get("topics", {}))
+        self.engagement.configure(self.config.get("engagement", {}), self.topic_matcher)
+        
+        # Carry adapted traits over unless the trait set itself changed
+        self.learning_rate = self.config.get("learning_rate", 0.05)
+        previous = self.traits
+        self.traits = self._build_trait_adapter()
+        if self.traits.names == previous.names:
+            self.traits.traits = list(previous.traits)
+        logger.info("Persona configuration reloaded")
+    
+    def _greeting_settings(self):
+        """Greeting coalescer arguments from the persona config"""
+        greeting_config = self.config.get("greetings", {})
+        return {
+            "greet_ttl": greeting_config.get("regreet_after", 3600),
+            "window": greeting_config.get("window", 30),
+            "max_messages_per_window": greeting_config.get("max_messages_per_window", 3),
+            "max_names_per_message": greeting_config.get("max_names_per_message", 10)
+        }
     
     def _default_persona_config(self):
         """Default persona configuration"""
@@ -49,6 +157,12 @@ class PersonaSystem:
             "response_timing": {
                 "min_delay": 1,
                 "max_delay": 3
+            },
+            "greetings": {
+                "regreet_after": 3600,
+                "window": 30,
+                "max_messages_per_window": 3,
+                "max_names_per_message": 10
             }
         }
     
@@ -60,6 +174,10 @@ class PersonaSystem:
                 "What's up, {username}!",
                 "Hello, {username}!"
             ],
+            "group_greetings": [
+                "Welcome in, {usernames}!",
+                "Hey {usernames}! Glad you're here!"
+            ],
             "generic_responses": [
                 "That's interesting, {username}!",
                 "I hear you, {username}.",
@@ -82,21 +200,137 @@ class PersonaSystem:
         # Implementation to be added
         return random.choice(self.responses["greetings"]).format(username=username)
     
+    def queue_greeting(self, username, user_id):
+        """Queue a user to be greeted in the next coalesced batch"""
+        return self.greetings.add(user_id, username)
+    
+    async def flush_greetings(self):
+        """Get greeting messages that are ready to send"""
+        return await self.greetings.flush()
+    
+    def get_group_greeting(self, usernames):
+        """Generate one greeting addressed to several users"""
+        templates = self.responses.get("group_greetings") or self._default_responses()["group_greetings"]
+        return random.choice(templates).format(usernames=usernames)
+    
+    def match_topics(self, text):
+        """Find persona topics mentioned in a message, grouped by category"""
+        return self.topic_matcher.scan(text)
+    
+    def observe_message(self, message, is_mentioned=False):
+        """Fold a chat message into mood and feedback, returning its topic matches"""
+        topics = self.match_topics(message.content)
+        emotes = count_emotes(message)
+        
+        # Configured topic phrases count alongside content words that aren't chat noise
+        terms = set(chat_terms(message.content))
+        for matches in topics.values():
+            terms.update(matches)
+        self.topic_tracker.add(terms)
+
+        self.mood_engine.observe(
+            message.content,
+            emotes=emotes,
+            keyword_hits=sum(len(matches) for matches in topics.values()),
+            gaming_hits=len(topics.get("gaming", ()))
+        )
+        
+        # Reactions shortly after the bot spoke count as feedback on its personality
+        if not self._feedback_seen and time.monotonic() < self._feedback_until:
+            tags = getattr(message, "tags", None) or {}
+            replied_to = tags.get("reply-parent-user-login", "").lower()
+            if is_mentioned or (self.bot_name and replied_to == self.bot_name):
+                self.traits.record("reply")
+                self._feedback_seen = True
+            elif emotes:
+                self.traits.record("emote_reaction")
+                self._feedback_seen = True
+        return topics
+    
+    def note_bot_message(self):
+        """Open a feedback window after the bot sends something"""
+        # A previous message that got no reaction counts as ignored
+        if not self._feedback_seen:
+            self.traits.record("ignored")
+        window = self.config.get("adaptation", {}).get("feedback_window", 60)
+        self._feedback_until = time.monotonic() + window
+        self._feedback_seen = False
+    
+    def tick(self):
+        """Periodic persona maintenance, applying batched trait feedback"""
+        if not self._feedback_seen and time.monotonic() >= self._feedback_until:
+            self.traits.record("ignored")
+            self._feedback_seen = True
+        if self.traits.tick():
+            logger.debug(f"Personality adapted: {self.personality}")
+    
+    def is_mentioned(self, text):
+        """Check whether a message mentions the bot by name"""
+        return bool(self.bot_name) and self.bot_name in text.lower()
+    
+    def should_engage(self, message, is_mentioned=None, topics=None):
+        """Decide what kind of reply a message deserves, or None to ignore it"""
+        if is_mentioned is None:
+            is_mentioned = self.is_mentioned(message.content)
+        return self.engagement.decide(message.content, is_mentioned, topics)
+    
+    def track_conversation(self, message, user_id):
+        """Add a chat message to its user's open conversation"""
+        tags = getattr(message, "tags", None) or {}
+        channel = getattr(message.channel, "name", None)
+        return self.conversations.add_message(
+            user_id,
+            message.content,
+            channel,
+            message_id=tags.get("id"),
+            reply_to=tags.get("reply-parent-msg-id")
+        )
+    
+    async def flush(self):
+        """Write batched profile changes and finished conversations"""
+        finished = await self.conversations.flush()
+        self.summaries.submit(finished)
+        for conversation in finished:
+            # Keep a short list of recent conversation ids on the profile
+            profile = await self.profiler.get_user_profile(conversation.user_id)
+            recent = (profile.get("conversations") or [])[-9:]
+            self.profiler.patch_profile(conversation.user_id, {"conversations": recent + [conversation.id]})
+        await self.profiler.flush()
+    
     async def parse_and_update_profile(self, message, user_id):
         """Extract information from message to update user profile"""
-        # Implementation to be added
-        pass
+        author = message.author
+        return await self.profiler.update_profile(
+            user_id, message.content, username=author.name, display_name=author.display_name
+        )
     
     async def get_conversation_starter(self, channel_mood=None):
         """Generate a conversation starter based on channel mood"""
-        # Implementation to be added
-        return random.choice(self.responses["conversation_starters"])
+        mood = channel_mood or self.mood
+        
+        # Sometimes pick up whatever chat has been talking about, if enough people did
+        min_count = self.config.get("engagement", {}).get("topic_starter_min_count", 5)
+        trending = [(topic, count) for topic, count in self.topic_tracker.top(k=3) if count >= min_count]
+        topic_starters = self.responses.get("topic_starters")
+        if trending and topic_starters and mood in ("neutral", "active") and random.random() < 0.5:
+            topic = random.choice(trending)[0]
+            return random.choice(topic_starters).format(topic=topic)
+        
+        pool = self.mood_engine.starter_pool(mood)
+        starters = self.responses.get(pool) or self.responses["conversation_starters"]
+        return random.choice(starters)
     
     async def generate_response(self, message, is_mentioned=False):
         """Generate response based on message content and context"""
         # Implementation to be added
         username = message.author.display_name
-        return random.choice(self.responses["generic_responses"]).format(username=username)
+        if is_question(message.content):
+            templates = self.responses["question_responses"]
+        elif is_mentioned and self.responses.get("mention_responses"):
+            templates = self.responses["mention_responses"]
+        else:
+            templates = self.responses["generic_responses"]
+        return random.choice(templates).format(username=username)
     
     def get_current_mode(self):
         """Get current bot personality mode"""
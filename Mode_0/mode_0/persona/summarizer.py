@@ -0,0 +1,116 @@
+"""
+Conversation summarization for the Mode_0 bot.
+"""
+import asyncio
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from mode_0.persona.topic_matcher import tokenize
+
+logger = logging.getLogger("mode_0.persona.summarizer")
+
+
+def summarize_conversation(lines, max_sentences=2, max_length=280):
+    """Extractive summary built from a conversation's most representative lines
+
+    Lines are scored by how many of the conversation's frequent words they
+    contain, normalised by length, then the best ones are joined in their
+    original order.
+    """
+    lines = [line.strip() for line in lines if line and line.strip()]
+    if not lines:
+        return ""
+    if len(lines) <= max_sentences:
+        return " | ".join(lines)[:max_length]
+
+    frequencies = Counter(word for line in lines for word in tokenize(line))
+    scores = []
+    for index, line in enumerate(lines):
+        words = tokenize(line)
+        score = sum(frequencies[word] for word in words) / (len(words) + 1) if words else 0.0
+        scores.append((score, index))
+
+    best = sorted(index for _, index in sorted(scores, reverse=True)[:max_sentences])
+    return " | ".join(lines[index] for index in best)[:max_length]
+
+
+def summarize_batch(batch):
+    """Summarize (conversation_id, lines) pairs; runs in a worker process"""
+    return [(conversation_id, summarize_conversation(lines)) for conversation_id, lines in batch]
+
+
+class SummaryPipeline:
+    """Summarizes closed conversations in a process pool
+
+    The event loop only queues conversations and awaits results; all text
+    processing happens in worker processes. Batches are bounded in size and
+    the number in flight is capped.
+    """
+
+    def __init__(self, db_manager, max_workers=1, batch_size=20, max_in_flight=2, max_queue=1000):
+        self.db = db_manager
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._executor = None
+        self._tasks = set()
+
+    def submit(self, conversations):
+        """Queue conversations for summarizing without blocking"""
+        for conversation in conversations:
+            if conversation.id is None or not conversation.messages:
+                continue
+            lines = [message.content for message in conversation.messages]
+            try:
+                self._queue.put_nowait((conversation.id, lines))
+            except asyncio.QueueFull:
+                logger.warning(f"Summary queue full, skipping conversation {conversation.id}")
+
+    async def run(self):
+        """Collect queued conversations into batches and dispatch them"""
+        if self._executor is None:
+            # Forked workers would inherit the bot's sockets and running loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Wait for a free slot before starting another batch
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._process(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch):
+        """Summarize one batch off the event loop and store the results"""
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._executor, summarize_batch, batch)
+            await self.db.update_conversation_summaries(results)
+            logger.debug(f"Summarized {len(results)} conversation(s)")
+        except Exception as e:
+            logger.error(f"Error summarizing conversations: {e}")
+        finally:
+            self._in_flight.release()
+            for _ in batch:
+                self._queue.task_done()
+
+    async def close(self, timeout=5.0):
+        """Give queued conversations a moment to finish, then stop the workers"""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping with {self._queue.qsize()} conversation(s) left unsummarized")
+        self.shutdown()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
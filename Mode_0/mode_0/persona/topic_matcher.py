@@ -0,0 +1,151 @@
+"""
+Multi-pattern topic matching for the Mode_0 bot.
+"""
+import logging
+import re
+from collections import deque
+
+logger = logging.getLogger("mode_0.persona.topics")
+
+# Splits emote codes such as "qwazi905Hype" into "qwazi905 Hype"
+_EMOTE_SPLIT = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could
+did do does dont for from get got had has have he her here him his how i im if
+in into is it its just know like lol lmao me more my no not now of oh ok okay on
+one or our out really so some than that thats the their them then there these
+they this to too up us was we well were what when where which who why will with
+would yeah yes you your
+""".split())
+
+# Greetings, filler and emote names that are common in any Twitch chat but never a topic
+CHAT_NOISE = frozenset("""
+hey hello hiya heya howdy sup wassup yoo morning evening night welcome bye cya later
+thanks thank thx gonna wanna gotta yea yep yup nah nope hmm hmmm uhh ugh lmfao rofl
+haha hahaha hehe omg wow nice cool damn bro dude man guys chat everyone stream
+streamer today tonight right good great much very still back going see
+kappa keepo lul lulw omegalul kekw pog pogchamp poggers pogu champ monka pepe pepega
+hands sadge copium kreygasm biblethump residentsleeper notlikethis wutface seemsgood
+coolstorybob trihard heyguys vohiyo jebaited failfish babyrage dansgame swiftrage
+4head 5head ezclap clap peepo widepeepohappy weirdchamp
+""".split())
+
+
+def normalize_text(text):
+    """Lowercase text and reduce it to space-separated words
+
+    Emote codes are split at their case boundary so a channel emote like
+    "qwazi905Hype" still counts as a mention of "qwazi905".
+    """
+    text = _EMOTE_SPLIT.sub(" ", text).lower()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def tokenize(text, min_length=3):
+    """Split text into lowercase content words, dropping stopwords and numbers"""
+    return [
+        word for word in normalize_text(text).split()
+        if len(word) >= min_length and word not in STOPWORDS and not word.isdigit()
+    ]
+
+
+def chat_terms(text):
+    """Content words worth tracking as chat topics, without greetings, filler or emotes"""
+    return [word for word in tokenize(text) if word not in CHAT_NOISE]
+
+
+class TopicMatcher:
+    """Aho-Corasick automaton over the persona topic lists
+
+    Each category in the config (e.g. "preferred", "engagement_boost") maps
+    to a list of phrases. A message is scanned once, in time linear in its
+    length, and matches are only reported on whole-word boundaries.
+    """
+
+    def __init__(self, categories=None):
+        # Trie nodes stored as parallel lists indexed by node id
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.patterns = {}
+
+        for category, phrases in (categories or {}).items():
+            for phrase in phrases:
+                self._add(phrase, category)
+        self._build()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a matcher from the persona "topics" config section"""
+        return cls({name: values for name, values in config.items() if isinstance(values, list)})
+
+    def _add(self, phrase, category):
+        """Insert a phrase into the trie"""
+        pattern = normalize_text(phrase)
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = child
+
+        if pattern not in self.patterns:
+            self.patterns[pattern] = set()
+            self._output[node].append(pattern)
+        self.patterns[pattern].add(category)
+
+    def _build(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def scan(self, text):
+        """Find topics mentioned in text, grouped by category
+
+        Returns a dict mapping each category to the matched topics, in the
+        order they first appear. Categories without matches are omitted.
+        """
+        if not self.patterns or not text:
+            return {}
+
+        normalized = normalize_text(text)
+        length = len(normalized)
+        found = {}
+        node = 0
+
+        for index, char in enumerate(normalized):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for pattern in self._output[node]:
+                start = index - len(pattern) + 1
+                # Only accept whole words so "dj" doesn't match "adjust"
+                if start > 0 and normalized[start - 1] != " ":
+                    continue
+                if index + 1 < length and normalized[index + 1] != " ":
+                    continue
+                for category in self.patterns[pattern]:
+                    topics = found.setdefault(category, [])
+                    if pattern not in topics:
+                        topics.append(pattern)
+
+        return found
@@ -0,0 +1,120 @@
+"""
+Bounded-memory conversation topic tracking for the Mode_0 bot.
+"""
+import logging
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger("mode_0.persona.topic_tracker")
+
+# Mersenne prime modulus for the sketch's row hashes
+_PRIME = (1 << 61) - 1
+
+
+class CountMinSketch:
+    """Approximate counts for an unbounded set of keys in fixed memory"""
+
+    def __init__(self, width=512, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        # One independent (a*x + b) mod p hash per row; hash((row, key)) collides
+        # on the same keys in every row, which defeats having several rows
+        seeds = random.Random(depth)
+        self._hashes = [(seeds.randrange(1, _PRIME), seeds.randrange(_PRIME)) for _ in range(depth)]
+
+    def _cells(self, key):
+        """Column for key in each row"""
+        x = hash(key) % _PRIME
+        return [(a * x + b) % _PRIME % self.width for a, b in self._hashes]
+
+    def add(self, key, count=1):
+        """Increment key, returning its new estimate"""
+        estimate = None
+        for row, column in zip(self.rows, self._cells(key)):
+            row[column] += count
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate
+
+    def estimate(self, key):
+        """Upper-bound estimate of how often key was added"""
+        return min(row[column] for row, column in zip(self.rows, self._cells(key)))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in a fixed number of counters"""
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, key, count=1):
+        """Count key, evicting the smallest counter when full"""
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + count
+            return
+
+        # The newcomer inherits the evicted count as its error bound
+        smallest = min(self.counts, key=self.counts.get)
+        self.counts[key] = self.counts.pop(smallest) + count
+
+    def keys(self):
+        return self.counts.keys()
+
+
+class TopicTracker:
+    """Top chat topics over a sliding window in fixed memory
+
+    The window is split into buckets, each with its own count-min sketch and
+    space-saving summary. Old buckets are recycled as time moves on, so
+    memory never grows with chat volume.
+    """
+
+    def __init__(self, window=600, buckets=6, top_k=10, width=512, depth=4):
+        self.bucket_span = window / buckets
+        self.top_k = top_k
+        self._width = width
+        self._depth = depth
+        self._buckets = deque(maxlen=buckets)
+        self._capacity = top_k * 4
+        self._trending = None
+
+    def _current(self, now):
+        """Bucket covering now, starting a new one if needed"""
+        if not self._buckets or now - self._buckets[-1][0] >= self.bucket_span:
+            self._buckets.append((now, CountMinSketch(self._width, self._depth), SpaceSaving(self._capacity)))
+        return self._buckets[-1]
+
+    def add(self, terms, now=None):
+        """Count each term once for a message"""
+        now = time.monotonic() if now is None else now
+        _, sketch, heavy = self._current(now)
+        for term in terms:
+            sketch.add(term)
+            heavy.add(term)
+
+    def top(self, k=None, window=None, now=None):
+        """Most-discussed topics as (topic, count) pairs, highest first"""
+        now = time.monotonic() if now is None else now
+        k = k or self.top_k
+        horizon = self.bucket_span * self._buckets.maxlen if window is None else window
+        live = [(sketch, heavy) for start, sketch, heavy in self._buckets
+                if now - start < horizon + self.bucket_span]
+        if not live:
+            return []
+
+        candidates = set()
+        for _, heavy in live:
+            candidates.update(heavy.keys())
+        totals = [(term, sum(sketch.estimate(term) for sketch, _ in live)) for term in candidates]
+        totals.sort(key=lambda item: item[1], reverse=True)
+        return totals[:k]
+
+    def trending(self, min_count=3, now=None):
+        """Set of current top topics, recomputed at most once per second"""
+        now = time.monotonic() if now is None else now
+        if self._trending is None or now - self._trending[0] >= 1.0:
+            self._trending = (now, {topic for topic, count in self.top(now=now) if count >= min_count})
+        return self._trending[1]
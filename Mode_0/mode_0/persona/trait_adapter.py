@@ -0,0 +1,100 @@
+"""
+Personality trait adaptation for the Mode_0 bot.
+"""
+import logging
+from collections import deque
+
+logger = logging.getLogger("mode_0.persona.traits")
+
+FEEDBACK_SIGNALS = ("reply", "emote_reaction", "ignored")
+
+# How strongly each kind of feedback pushes each trait
+DEFAULT_INFLUENCE = {
+    "reply": {"friendly": 0.5, "helpfulness": 0.5, "humor": 0.2},
+    "emote_reaction": {"humor": 0.6, "edginess": 0.3, "friendly": 0.1},
+    "ignored": {"friendly": -0.2, "humor": -0.4, "edginess": -0.5},
+}
+
+
+class TraitAdapter:
+    """Adapts the persona trait vector from chat feedback
+
+    Feedback is only counted as it arrives. Each tick folds the counts into
+    the trait vector with a single matrix-vector update, so the cost of
+    adapting is the same whether chat sent ten messages or ten thousand.
+    """
+
+    def __init__(self, base_traits, learning_rate=0.05, influence=None,
+                 reversion=0.1, max_snapshots=20):
+        influence = influence or DEFAULT_INFLUENCE
+        self.names = list(base_traits)
+        self.base = [float(base_traits[name]) for name in self.names]
+        self.traits = list(self.base)
+        self.learning_rate = learning_rate
+        self.reversion = reversion
+
+        # Rows are feedback signals, columns are traits
+        self.influence = [
+            [influence.get(signal, {}).get(name, 0.0) for name in self.names]
+            for signal in FEEDBACK_SIGNALS
+        ]
+        self._index = {signal: i for i, signal in enumerate(FEEDBACK_SIGNALS)}
+        self._pending = [0] * len(FEEDBACK_SIGNALS)
+
+        self._snapshots = deque(maxlen=max_snapshots)
+        self._next_snapshot = 0
+
+    def record(self, signal, count=1):
+        """Count feedback to be applied on the next tick"""
+        index = self._index.get(signal)
+        if index is None:
+            logger.debug(f"Ignoring unknown feedback signal: {signal}")
+            return
+        self._pending[index] += count
+
+    def tick(self):
+        """Apply all feedback recorded since the last tick"""
+        total = sum(self._pending)
+        if not total:
+            return False
+
+        # Use the mix of feedback rather than its volume, so busy chats don't adapt faster
+        weights = [count / total for count in self._pending]
+        delta = [
+            sum(weight * row[column] for weight, row in zip(weights, self.influence))
+            for column in range(len(self.names))
+        ]
+
+        rate = self.learning_rate
+        self.traits = [
+            min(1.0, max(0.0, trait + rate * change + rate * self.reversion * (base - trait)))
+            for trait, change, base in zip(self.traits, delta, self.base)
+        ]
+        self._pending = [0] * len(FEEDBACK_SIGNALS)
+        return True
+
+    def snapshot(self):
+        """Save the current traits, returning an id for rollback"""
+        snapshot_id = self._next_snapshot
+        self._next_snapshot += 1
+        self._snapshots.append((snapshot_id, tuple(self.traits)))
+        return snapshot_id
+
+    def rollback(self, snapshot_id=None):
+        """Restore traits from a snapshot, the latest one by default"""
+        for saved_id, traits in reversed(self._snapshots):
+            if snapshot_id is None or saved_id == snapshot_id:
+                self.traits = list(traits)
+                self._pending = [0] * len(FEEDBACK_SIGNALS)
+                return True
+        logger.warning(f"Trait snapshot not found: {snapshot_id}")
+        return False
+
+    def reset(self):
+        """Return to the configured base personality"""
+        self.traits = list(self.base)
+        self._pending = [0] * len(FEEDBACK_SIGNALS)
+
+    def as_dict(self):
+        """Current traits keyed by name"""
+        return dict(zip(self.names, self.traits))
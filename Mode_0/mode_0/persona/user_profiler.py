@@ -3,45 +3,142 @@ User profiling system for the Mode_0 bot.
 """
 import json
 import logging
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from mode_0.persona.interests import InterestExtractor
+from mode_0.persona.topic_matcher import tokenize
 
 logger = logging.getLogger("mode_0.persona.profiler")
 
 class UserProfiler:
     """Analyzes and builds user profiles"""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, topic_tracker=None, max_interests=5,
+                 session_gap=1800, max_cached=5000):
         self.db = db_manager
+        self.topic_tracker = topic_tracker
+        self.interests = InterestExtractor(top_n=max_interests)
+        self.session_gap = timedelta(seconds=session_gap)
+        self.max_cached = max_cached
+        
+        # Profiles loaded once and kept current in memory
+        self._profiles = OrderedDict()
+        
+        # Changes waiting to be written, keyed by user id
+        self._pending = {}
     
     async def get_user_profile(self, user_id):
         """Get user profile data"""
-        return await self.db.get_user_profile(user_id)
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            self._profiles.move_to_end(user_id)
+            return profile
+        
+        profile = await self.db.get_user_profile(user_id)
+        
+        # Unflushed changes are newer than what the database has
+        pending = self._pending.get(user_id)
+        if pending:
+            profile.update(pending["profile"])
+        
+        self._profiles[user_id] = profile
+        if len(self._profiles) > self.max_cached:
+            self._profiles.popitem(last=False)
+        return profile
+    
+    def patch_profile(self, user_id, fields):
+        """Merge changed profile fields in memory and queue them for the next flush"""
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            profile.update(fields)
+        pending = self._pending_for(user_id)
+        pending["profile"].update(fields)
+    
+    def _pending_for(self, user_id):
+        """Pending delta for a user, created on first use"""
+        pending = self._pending.get(user_id)
+        if pending is None:
+            pending = self._pending[user_id] = {
+                "username": None,
+                "display_name": None,
+                "last_seen": None,
+                "messages": 0,
+                "profile": {}
+            }
+        return pending
     
-    async def update_profile(self, user_id, message):
+    async def update_profile(self, user_id, message, username=None, display_name=None):
         """Update user profile based on message content"""
         profile = await self.get_user_profile(user_id)
+        now = datetime.now()
+        changes = {"last_seen": now.isoformat()}
         
         # Initialize profile if empty
         if not profile:
-            profile = {
-                "first_seen": datetime.now().isoformat(),
+            changes.update({
+                "first_seen": now.isoformat(),
                 "visits": 1,
                 "interests": [],
                 "conversations": []
-            }
-        
-        # Update profile data
-        profile["last_seen"] = datetime.now().isoformat()
-        profile["visits"] = profile.get("visits", 0) + 1
+            })
+        else:
+            # A visit is a return after a gap, not every message
+            last_seen = profile.get("last_seen")
+            if last_seen is None or now - datetime.fromisoformat(last_seen) >= self.session_gap:
+                changes["visits"] = profile.get("visits", 0) + 1
         
         # Extract potential topics of interest
-        # Implementation to be added
+        insights = await self.analyze_message(message)
+        if user_id not in self.interests and profile.get("interests"):
+            # Carry stored interests over after a restart
+            self.interests.update(user_id, profile["interests"])
+        
+        # Trending topics count double so shared interests surface sooner
+        self.interests.update(user_id, insights.get("terms", []) + insights.get("topics", []))
+        interests = self.interests.top_interests(user_id)
+        if interests and interests != profile.get("interests"):
+            changes["interests"] = interests
         
-        # Update profile in database
-        await self.db.update_user_profile(user_id, profile)
+        self._profiles.setdefault(user_id, profile)
+        self.patch_profile(user_id, changes)
+        
+        # User row bookkeeping rides along with the same flush
+        pending = self._pending_for(user_id)
+        pending["messages"] += 1
+        pending["last_seen"] = now
+        if username is not None:
+            pending["username"] = username
+            pending["display_name"] = display_name or username
         return profile
     
+    async def flush(self):
+        """Write all pending profile changes in one batch"""
+        if not self._pending:
+            return 0
+        
+        pending, self._pending = self._pending, {}
+        try:
+            await self.db.apply_user_deltas(pending)
+        except Exception:
+            # Put the batch back so the changes are retried on the next flush
+            for user_id, delta in pending.items():
+                if user_id in self._pending:
+                    newer = self._pending[user_id]
+                    delta["messages"] += newer["messages"]
+                    delta["profile"].update(newer["profile"])
+                    for key in ("username", "display_name", "last_seen"):
+                        delta[key] = newer[key] or delta[key]
+                self._pending[user_id] = delta
+            raise
+        return len(pending)
+    
     async def analyze_message(self, message):
         """Analyze message content for insights"""
-        # Implementation to be added
-        return {}
+        terms = tokenize(message)
+        if self.topic_tracker is None:
+            return {"terms": terms, "topics": []}
+        
+        # Words the user shares with what chat is currently talking about
+        trending = self.topic_tracker.trending()
+        topics = [word for word in dict.fromkeys(terms) if word in trending]
+        return {"terms": terms, "topics": topics}
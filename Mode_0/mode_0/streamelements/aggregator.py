@@ -0,0 +1,133 @@
+"""
+Burst aggregation for StreamElements alerts.
+"""
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger("mode_0.streamelements.aggregator")
+
+# Fallback templates when responses.json doesn't define them
+DEFAULT_TEMPLATES = {
+    "follow_alerts": ["Thanks for the follow, {username}! Welcome to the crew!"],
+    "follow_burst_alerts": ["Welcome to the {count} new followers! {names}"],
+    "follow_count_alerts": ["{count} new follower{plural}! Welcome to the crew!"],
+    "sub_alerts": ["Thanks for subscribing, {username}!"],
+    "sub_burst_alerts": ["{count} new subs! Huge thanks to {names}!"],
+    "sub_count_alerts": ["{count} new sub{plural}! Thank you!"],
+    "gift_alerts": ["{username} just gifted {count} sub{plural}! Thank you!"],
+    "gift_burst_alerts": ["{username} just gifted {count} subs! Thank you!"],
+}
+
+
+class AlertBucket:
+    """Alerts of one kind collected during a window"""
+
+    __slots__ = ("opened", "count", "names")
+
+    def __init__(self, opened):
+        self.opened = opened
+        self.count = 0
+        self.names = []
+
+
+class BurstAggregator:
+    """Collapses follow and sub bursts into a bounded number of chat messages
+
+    Alerts are counted into per-kind buckets. When a bucket's window closes
+    it becomes individual thank-yous if it is small, or one summary message
+    if it is a burst. A global cap limits messages per window; buckets that
+    don't fit wait for the next window and keep accumulating.
+    """
+
+    def __init__(self, send, responses=None, window=10, burst_threshold=3,
+                 max_messages_per_window=2, max_names=5):
+        self.send = send
+        self.responses = responses or {}
+        self.window = window
+        self.burst_threshold = burst_threshold
+        self.max_messages_per_window = max_messages_per_window
+        self.max_names = max_names
+
+        self.buckets = {}
+        self._window_start = 0.0
+        self._window_sent = 0
+        self._task = None
+
+    def add(self, kind, username, key=None, now=None):
+        """Count one alert; kind is "follow", "sub" or "gift"
+
+        For gifts, key is the gifter and username the gifter's display name.
+        """
+        now = time.monotonic() if now is None else now
+        bucket_key = (kind, key)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self.buckets[bucket_key] = AlertBucket(now)
+        bucket.count += 1
+        if len(bucket.names) < self.max_names and username and username not in bucket.names:
+            bucket.names.append(username)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _template(self, name):
+        templates = self.responses.get(name) or DEFAULT_TEMPLATES[name]
+        return random.choice(templates)
+
+    def _render(self, kind, bucket, budget):
+        """Messages for a closed bucket, collapsing to a summary when needed"""
+        if kind == "gift":
+            template = "gift_burst_alerts" if bucket.count >= self.burst_threshold else "gift_alerts"
+            return [self._template(template).format(
+                username=bucket.names[0] if bucket.names else "Someone",
+                count=bucket.count,
+                plural="s" if bucket.count != 1 else ""
+            )]
+
+        # Individual thanks only when every alert came with a name
+        if bucket.count == len(bucket.names) and bucket.count < self.burst_threshold and bucket.count <= budget:
+            return [self._template(f"{kind}_alerts").format(username=name) for name in bucket.names]
+
+        if not bucket.names:
+            return [self._template(f"{kind}_count_alerts").format(
+                count=bucket.count, plural="s" if bucket.count != 1 else ""
+            )]
+
+        names = ", ".join(bucket.names)
+        if bucket.count > len(bucket.names):
+            names = f"{names} and {bucket.count - len(bucket.names)} more"
+        return [self._template(f"{kind}_burst_alerts").format(count=bucket.count, names=names)]
+
+    def collect(self, now=None):
+        """Messages due now, within the per-window cap"""
+        now = time.monotonic() if now is None else now
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._window_sent = 0
+
+        messages = []
+        for bucket_key in list(self.buckets):
+            bucket = self.buckets[bucket_key]
+            if now - bucket.opened < self.window:
+                continue
+            budget = self.max_messages_per_window - self._window_sent - len(messages)
+            if budget <= 0:
+                # Leave it to grow into a summary in the next window
+                break
+            del self.buckets[bucket_key]
+            messages.extend(self._render(bucket_key[0], bucket, budget))
+
+        self._window_sent += len(messages)
+        return messages
+
+    async def _run(self):
+        """Send due messages until there is nothing left pending"""
+        while self.buckets:
+            await asyncio.sleep(1)
+            for message in self.collect():
+                try:
+                    await self.send(message)
+                except Exception as e:
+                    logger.error(f"Error sending alert: {e}")
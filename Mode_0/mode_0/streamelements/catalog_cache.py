@@ -0,0 +1,78 @@
+"""
+On-disk cache of the StreamElements command catalog.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("mode_0.streamelements.catalog")
+
+
+class CatalogCache:
+    """Persists commands and game categories with their ETag and fetch time
+
+    A cached catalog is usable immediately at startup. It only needs
+    revalidating once its TTL has passed, and revalidation is a conditional
+    request that costs a 304 when nothing changed.
+    """
+
+    def __init__(self, path="data/se_catalog.json", ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.etag = None
+        self.fetched_at = 0.0
+
+    def load(self):
+        """Read the cached catalog, returning None if there isn't a usable one"""
+        try:
+            with open(self.path, "r") as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable command catalog cache: {e}")
+            return None
+        if not isinstance(cached, dict):
+            logger.warning("Ignoring command catalog cache that isn't a JSON object")
+            return None
+
+        self.etag = cached.get("etag")
+        self.fetched_at = cached.get("fetched_at", 0.0)
+        logger.info(f"Loaded {len(cached.get('commands', {}))} cached StreamElements commands")
+        return cached
+
+    def is_fresh(self, now=None):
+        """Whether the catalog was validated within the TTL"""
+        now = time.time() if now is None else now
+        return now - self.fetched_at < self.ttl
+
+    def mark_validated(self, etag=None, now=None):
+        """Record a successful fetch or 304 revalidation"""
+        self.fetched_at = time.time() if now is None else now
+        if etag:
+            self.etag = etag
+
+    def _write(self, state):
+        """Atomically replace the cache file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+    async def save(self, commands, games):
+        """Write the catalog without blocking the event loop"""
+        state = {
+            "etag": self.etag,
+            "fetched_at": self.fetched_at,
+            "commands": commands,
+            "games": games
+        }
+        try:
+            await asyncio.to_thread(self._write, state)
+        except OSError as e:
+            logger.warning(f"Could not save command catalog cache: {e}")
@@ -0,0 +1,157 @@
+"""
+Event de-duplication for StreamElements events.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("mode_0.streamelements.dedup")
+
+
+class BloomFilter:
+    """Fixed-size bloom filter using stable hashes, so it can be saved to disk"""
+
+    def __init__(self, size_bits=1 << 20, hashes=7, bits=None):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.bits = bits if bits is not None else bytearray(size_bits // 8)
+
+    def _positions(self, key):
+        """Bit positions for key, derived from one blake2b digest"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size_bits for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class EventDeduplicator:
+    """Time-bounded, memory-capped record of seen event ids
+
+    Recent ids are kept exactly in an insertion-ordered dict. Older ids live
+    in two rotating bloom filters, so each id is remembered for between one
+    and two rotation periods at a fixed memory cost. Every check is O(1).
+    """
+
+    def __init__(self, path="data/se_seen_events.json", recent_window=3600,
+                 max_recent=10000, rotation=86400, size_bits=1 << 20, hashes=7):
+        self.path = path
+        self.recent_window = recent_window
+        self.max_recent = max_recent
+        self.rotation = rotation
+        self.size_bits = size_bits
+        self.hashes = hashes
+
+        self._recent = OrderedDict()
+        self._current = BloomFilter(size_bits, hashes)
+        self._previous = BloomFilter(size_bits, hashes)
+        self._rotated_at = time.time()
+
+        self.duplicates = 0
+        self._dirty = False
+
+    @staticmethod
+    def event_id(event):
+        """Stable id for an event, falling back to a hash of its contents"""
+        event_id = event.get("_id") or event.get("activityId")
+        if event_id:
+            return str(event_id)
+        # createdAt tells apart repeats of identical events, e.g. two equal tips
+        body = json.dumps(
+            [event.get("type"), event.get("data"), event.get("createdAt")], sort_keys=True, default=str
+        )
+        return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _expire(self, now):
+        """Drop old exact entries and rotate the bloom filters"""
+        while self._recent:
+            key, seen_at = next(iter(self._recent.items()))
+            if now - seen_at < self.recent_window and len(self._recent) <= self.max_recent:
+                break
+            self._recent.popitem(last=False)
+
+        if now - self._rotated_at >= self.rotation:
+            self._previous = self._current
+            self._current = BloomFilter(self.size_bits, self.hashes)
+            self._rotated_at = now
+
+    def seen(self, event, now=None):
+        """Return True if the event was already recorded"""
+        now = time.time() if now is None else now
+        self._expire(now)
+        key = self.event_id(event)
+
+        if key in self._recent or key in self._current or key in self._previous:
+            self.duplicates += 1
+            return True
+        return False
+
+    def record(self, event, now=None):
+        """Remember an event so later copies are skipped"""
+        key = self.event_id(event)
+        self._recent[key] = time.time() if now is None else now
+        self._current.add(key)
+        self._dirty = True
+
+    def load(self):
+        """Restore seen ids saved by a previous run"""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Could not load seen event ids from {self.path}: {e}")
+            return
+
+        if state.get("size_bits") != self.size_bits or state.get("hashes") != self.hashes:
+            logger.info("Seen event filter settings changed, starting fresh")
+            return
+
+        self._current = BloomFilter(self.size_bits, self.hashes, bytearray(base64.b64decode(state["current"])))
+        self._previous = BloomFilter(self.size_bits, self.hashes, bytearray(base64.b64decode(state["previous"])))
+        self._rotated_at = state.get("rotated_at", time.time())
+        self._recent = OrderedDict(state.get("recent", []))
+        logger.info(f"Loaded {len(self._recent)} recent event ids")
+
+    def snapshot(self):
+        """Copy of the current state for saving, or None if nothing changed"""
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return {
+            "size_bits": self.size_bits,
+            "hashes": self.hashes,
+            "rotated_at": self._rotated_at,
+            "current": base64.b64encode(bytes(self._current.bits)).decode("ascii"),
+            "previous": base64.b64encode(bytes(self._previous.bits)).decode("ascii"),
+            "recent": list(self._recent.items())
+        }
+
+    def write(self, state):
+        """Write a snapshot to disk; safe to run in a worker thread"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename so a crash never leaves a half-written file
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+    def save(self):
+        """Persist seen ids so duplicates are caught across restarts"""
+        state = self.snapshot()
+        if state is not None:
+            self.write(state)
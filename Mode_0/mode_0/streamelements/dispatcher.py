@@ -0,0 +1,126 @@
+"""
+Table-driven event dispatch for StreamElements events.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from mode_0.streamelements.http_client import LatencyHistogram
+
+logger = logging.getLogger("mode_0.streamelements.dispatcher")
+
+
+class HandlerPool:
+    """Bounded queue and worker tasks for one event type"""
+
+    def __init__(self, event_type, handler, concurrency=1, queue_size=100):
+        self.event_type = event_type
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = []
+
+        # Counters
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+        self.wait = LatencyHistogram()
+
+    def start(self):
+        """Start worker tasks if they aren't running"""
+        if not self.workers:
+            self.workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    def submit(self, event):
+        """Queue an event without waiting, returning False if it was dropped"""
+        self.received += 1
+        try:
+            self.queue.put_nowait((time.perf_counter(), event))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Dropping {self.event_type} event, handler queue full")
+            return False
+        self.start()
+        return True
+
+    async def _work(self):
+        """Run the handler for queued events"""
+        while True:
+            queued_at, event = await self.queue.get()
+            started = time.perf_counter()
+            self.wait.observe(started - queued_at)
+            try:
+                await self.handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error handling {self.event_type} event: {e}")
+            finally:
+                self.latency.observe(time.perf_counter() - started)
+                self.queue.task_done()
+
+    async def stop(self):
+        """Cancel worker tasks"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "latency": self.latency.snapshot(),
+            "wait": self.wait.snapshot(),
+        }
+
+
+class EventDispatcher:
+    """Routes events to per-type handler pools
+
+    Each event type has its own queue and workers, so a slow handler only
+    delays events of its own type. Dispatching is a dict lookup and a
+    non-blocking put; unknown types are only counted.
+    """
+
+    def __init__(self):
+        self.pools = {}
+        self.unknown = Counter()
+
+    def register(self, event_type, handler, concurrency=1, queue_size=100):
+        """Register the handler coroutine for an event type"""
+        self.pools[event_type] = HandlerPool(event_type, handler, concurrency, queue_size)
+
+    def dispatch(self, event):
+        """Hand an event to its pool, returning False if it wasn't accepted"""
+        event_type = event.get("type")
+        pool = self.pools.get(event_type)
+        if pool is None:
+            self.unknown[event_type] += 1
+            return False
+        return pool.submit(event)
+
+    async def drain(self, timeout=None):
+        """Wait until every queued event has been handled, returning False on timeout"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(pool.queue.join() for pool in self.pools.values())), timeout
+            )
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self):
+        """Stop all worker tasks"""
+        await asyncio.gather(*(pool.stop() for pool in self.pools.values()))
+
+    def stats(self):
+        """Throughput and latency counters for each event type"""
+        stats = {event_type: pool.stats() for event_type, pool in self.pools.items()}
+        stats["unknown"] = dict(self.unknown)
+        return stats
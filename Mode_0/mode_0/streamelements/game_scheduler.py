@@ -0,0 +1,96 @@
+"""
+Scheduling for StreamElements chat games.
+"""
+import heapq
+import logging
+import random
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("mode_0.streamelements.games")
+
+
+class GameScheduler:
+    """Tracks game cooldowns so the bot never launches a game SE would reject
+
+    Each game type keeps a min-heap of (ready_at, game). Choosing a game pops
+    the games that are ready, which is O(log n) per game touched. Group games
+    are serialized - only one may run at a time - and duels are throttled
+    per opponent.
+    """
+
+    def __init__(self, games, cooldowns=None, default_cooldown=60,
+                 group_duration=120, duel_cooldown=600, max_tracked_users=1000):
+        self.cooldowns = cooldowns or {}
+        self.default_cooldown = default_cooldown
+        self.group_duration = group_duration
+        self.duel_cooldown = duel_cooldown
+        self.max_tracked_users = max_tracked_users
+
+        self.heaps = {}
+        self.group_busy_until = 0.0
+        self._last_duel = OrderedDict()
+        self.load(games)
+
+    def load(self, games):
+        """Rebuild the heaps from the manager's game buckets
+
+        Games that were already scheduled keep their cooldowns, so a catalog
+        refresh can't make the bot replay a game SE would still reject.
+        """
+        ready_at = {name: at for heap in self.heaps.values() for at, name in heap}
+        self.heaps = {
+            game_type: [(ready_at.get(name, 0.0), name) for name in names]
+            for game_type, names in games.items()
+        }
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+
+    def _cooldown(self, game):
+        return self.cooldowns.get(game, self.default_cooldown)
+
+    def next_ready(self, game_type):
+        """Seconds until a game of this type can be played"""
+        heap = self.heaps.get(game_type)
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - time.monotonic())
+
+    def acquire(self, game_type, opponent=None, now=None):
+        """Pick a ready game and start its cooldown, or return None if none is eligible"""
+        now = time.monotonic() if now is None else now
+        heap = self.heaps.get(game_type)
+        if not heap or heap[0][0] > now:
+            return None
+
+        if game_type == "group" and now < self.group_busy_until:
+            return None
+        if game_type == "duel":
+            if opponent is None:
+                return None
+            opponent = opponent.lower()
+            last = self._last_duel.get(opponent)
+            if last is not None and now - last < self.duel_cooldown:
+                return None
+
+        # Pop every ready game and choose among them, pushing the rest back
+        ready = []
+        while heap and heap[0][0] <= now and len(ready) < 5:
+            ready.append(heapq.heappop(heap)[1])
+        game = random.choice(ready)
+        for name in ready:
+            ready_at = now + self._cooldown(name) if name == game else now
+            heapq.heappush(heap, (ready_at, name))
+
+        if game_type == "group":
+            self.group_busy_until = now + self.group_duration
+        elif game_type == "duel":
+            self._last_duel[opponent] = now
+            self._last_duel.move_to_end(opponent)
+            if len(self._last_duel) > self.max_tracked_users:
+                self._last_duel.popitem(last=False)
+        return game
+
+    def group_finished(self):
+        """Allow the next group game before the default duration is up"""
+        self.group_busy_until = 0.0
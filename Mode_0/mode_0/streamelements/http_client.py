@@ -0,0 +1,207 @@
+"""
+Pooled HTTP client for the StreamElements REST API.
+"""
+import aiohttp
+import asyncio
+import bisect
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping
+from mode_0.streamelements.rate_limit import RateLimitGovernor
+
+logger = logging.getLogger("mode_0.streamelements.http")
+
+# Status codes worth retrying with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Methods that are safe to send twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class APIResponse:
+    """Result of a StreamElements API call"""
+    status: int
+    data: Any
+    headers: Mapping[str, str]
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+
+class StreamElementsError(Exception):
+    """Raised when a StreamElements API call fails after all retries"""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one endpoint"""
+
+    BOUNDS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.retries = 0
+
+    def observe(self, seconds):
+        """Record one request duration"""
+        self.buckets[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of requests"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.BOUNDS + (float("inf"),), self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Summary suitable for logging"""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class StreamElementsClient:
+    """Long-lived aiohttp session shared by all StreamElements REST calls
+
+    Connections are kept alive and pooled per host, DNS lookups are cached,
+    and failed idempotent requests are retried with jittered exponential
+    backoff. Every attempt goes through the rate-limit governor first.
+    """
+
+    def __init__(self, base_url, headers, timeout=10, connect_timeout=5,
+                 limit=20, limit_per_host=10, dns_cache_ttl=300, keepalive_timeout=30,
+                 max_retries=3, backoff_base=0.5, backoff_cap=8.0, limiter=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.latency = {}
+        self.limiter = limiter or RateLimitGovernor()
+        self._session = None
+
+    def _get_session(self):
+        """Create the shared session on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=connector
+            )
+        return self._session
+
+    def _backoff(self, attempt, retry_after=None):
+        """Delay before the next attempt, using full jitter"""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_cap)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method, path, endpoint=None, critical=True, idempotent=None, **kwargs):
+        """Send a request, retrying transient failures
+
+        endpoint names the histogram and rate-limit bucket the call is
+        recorded under; pass a template such as "points/{user}" to keep
+        per-user calls together. Non-critical calls raise RateLimited
+        instead of waiting when the endpoint is close to its limit.
+        Only idempotent requests - GET, HEAD and OPTIONS unless
+        idempotent says otherwise - are retried after errors, since
+        anything else may already have been applied; a 429 is always
+        retried because the server rejected the call unprocessed.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        endpoint = endpoint or path
+        histogram = self.latency.setdefault(endpoint, LatencyHistogram())
+        session = self._get_session()
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                histogram.retries += 1
+            await self.limiter.acquire(endpoint, critical)
+            started = time.perf_counter()
+            try:
+                async with session.request(method, url, **kwargs) as resp:
+                    if resp.content_type == "application/json":
+                        data = await resp.json()
+                    else:
+                        data = await resp.text()
+                    histogram.observe(time.perf_counter() - started)
+                    response = APIResponse(resp.status, data, resp.headers.copy())
+                self.limiter.update(endpoint, response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                histogram.observe(time.perf_counter() - started)
+                if attempt == self.max_retries or not idempotent:
+                    histogram.errors += 1
+                    raise StreamElementsError(f"{method} {path} failed: {e}") from e
+                logger.warning(f"StreamElements {method} {path} failed ({e}), retrying")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            retryable = response.status in RETRY_STATUSES and (idempotent or response.status == 429)
+            if not retryable or attempt == self.max_retries:
+                if response.status >= 400:
+                    histogram.errors += 1
+                return response
+
+            logger.warning(f"StreamElements {method} {path} returned {response.status}, retrying")
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            if response.status == 429:
+                # Hold every caller of this endpoint, not just this retry
+                self.limiter.throttle(endpoint, delay)
+            else:
+                await asyncio.sleep(delay)
+
+    async def get(self, path, endpoint=None, critical=True, **kwargs):
+        return await self.request("GET", path, endpoint=endpoint, critical=critical, **kwargs)
+
+    async def post(self, path, endpoint=None, critical=True, idempotent=False, **kwargs):
+        return await self.request("POST", path, endpoint=endpoint, critical=critical,
+                                  idempotent=idempotent, **kwargs)
+
+    def latency_report(self):
+        """Latency summary for every endpoint called so far"""
+        return {endpoint: histogram.snapshot() for endpoint, histogram in self.latency.items()}
+
+    def quota_report(self):
+        """How close each endpoint is to its rate limit"""
+        return self.limiter.report()
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,156 @@
+"""
+Cached StreamElements loyalty points lookups.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from mode_0.streamelements.http_client import StreamElementsError
+from mode_0.streamelements.rate_limit import RateLimited
+
+logger = logging.getLogger("mode_0.streamelements.loyalty")
+
+
+class SingleFlightCache:
+    """Read-through cache where concurrent misses for a key share one load"""
+
+    def __init__(self, ttl=30, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._values = OrderedDict()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def peek(self, key, now=None):
+        """Cached value if still fresh, else None"""
+        now = time.monotonic() if now is None else now
+        entry = self._values.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        return entry[1]
+
+    def put(self, key, value, now=None):
+        """Store a value with a fresh TTL"""
+        now = time.monotonic() if now is None else now
+        self._values[key] = (now + self.ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    async def get(self, key, loader):
+        """Return the cached value, or load it once for all concurrent callers"""
+        while True:
+            value = self.peek(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only our own cancellation propagates; if the leader was cancelled, load it ourselves
+                if asyncio.current_task().cancelling() or not future.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited isn't logged as unhandled
+            future.exception()
+            raise
+        else:
+            if value is not None:
+                self.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            # A cancelled leader must not leave its followers waiting forever;
+            # they see the cancelled future and retry the load themselves
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
+
+
+class LoyaltyService:
+    """Loyalty points and leaderboard lookups that stay within SE's rate limits
+
+    Per-user lookups are cached briefly and coalesced while in flight. The
+    leaderboard is always fetched at its full configured size and sliced,
+    and its entries also answer per-user lookups for the users it lists.
+    """
+
+    def __init__(self, http, channel_id, points_ttl=30, leaderboard_ttl=60, leaderboard_size=25):
+        self.http = http
+        self.channel_id = channel_id
+        self.leaderboard_size = leaderboard_size
+        self.points = SingleFlightCache(ttl=points_ttl)
+        self.leaderboards = SingleFlightCache(ttl=leaderboard_ttl, max_entries=4)
+
+    async def get_points(self, username):
+        """Points record for a user, or None if unavailable"""
+        username = username.lower()
+        return await self.points.get(username, lambda: self._fetch_points(username))
+
+    async def _fetch_points(self, username):
+        try:
+            response = await self.http.get(
+                f"points/{self.channel_id}/{username}", endpoint="points/{user}", critical=False
+            )
+        except RateLimited as e:
+            logger.debug(str(e))
+            return None
+        except StreamElementsError as e:
+            logger.warning(f"Could not fetch points for {username}: {e}")
+            return None
+        if not response.ok or not isinstance(response.data, dict):
+            return None
+        return response.data
+
+    async def get_leaderboard(self, limit=10):
+        """Top users by points, highest first"""
+        users = await self.leaderboards.get("top", self._fetch_leaderboard)
+        return (users or [])[:limit]
+
+    async def _fetch_leaderboard(self):
+        try:
+            response = await self.http.get(
+                f"points/{self.channel_id}/top",
+                endpoint="points/top",
+                params={"limit": self.leaderboard_size},
+                critical=False
+            )
+        except RateLimited as e:
+            logger.debug(str(e))
+            return None
+        except StreamElementsError as e:
+            logger.warning(f"Could not fetch points leaderboard: {e}")
+            return None
+        if not response.ok or not isinstance(response.data, dict):
+            return None
+
+        users = response.data.get("users", [])
+
+        # Leaderboard rows double as cached per-user lookups
+        for rank, user in enumerate(users, start=1):
+            if user.get("username"):
+                username = user["username"].lower()
+                if self.points.peek(username) is None:
+                    self.points.put(username, {**user, "rank": rank})
+        return users
+
+    def stats(self):
+        """Cache effectiveness counters"""
+        return {
+            name: {"hits": cache.hits, "misses": cache.misses, "coalesced": cache.coalesced}
+            for name, cache in (("points", self.points), ("leaderboard", self.leaderboards))
+        }
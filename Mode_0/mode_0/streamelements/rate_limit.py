@@ -0,0 +1,202 @@
+"""
+Client-side rate limiting for the StreamElements REST API.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("mode_0.streamelements.ratelimit")
+
+# How long reported quota is trusted when the server gives no reset time
+HEADER_TTL = 60.0
+
+
+class RateLimited(Exception):
+    """Raised when a non-critical call is shed to protect the API quota"""
+
+
+def parse_reset(value, now=None):
+    """Seconds until a rate-limit reset header value, which may be a delta or an epoch"""
+    now = time.time() if now is None else now
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e12:
+        reset = reset / 1000 - now
+    elif reset > 1e9:
+        reset = reset - now
+    return max(0.0, reset)
+
+
+class TokenBucket:
+    """Token bucket that lets callers reserve a slot and wait their turn"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until",
+                 "limit", "remaining", "synced_at", "resets_at", "queued", "shed")
+
+    def __init__(self, rate, capacity, now=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic() if now is None else now
+        self.blocked_until = 0.0
+        self.limit = None
+        self.remaining = None
+        self.synced_at = None
+        self.resets_at = None
+        self.queued = 0
+        self.shed = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """Seconds a new call would have to wait"""
+        self.refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def reserve(self, now):
+        """Take a token, possibly going into debt, and return the wait for it"""
+        wait = self.delay(now)
+        self.tokens -= 1
+        return wait
+
+    def headers_fresh(self, now):
+        """Whether the last reported limit and remaining still describe the quota"""
+        if self.synced_at is None:
+            return False
+        if self.resets_at is not None:
+            return now < self.resets_at
+        return now - self.synced_at < HEADER_TTL
+
+    def utilization(self, now):
+        """Fraction of the quota in use, the higher of the server's view and ours"""
+        self.refill(now)
+        local = 1 - max(0.0, self.tokens) / self.capacity
+        if self.limit and self.remaining is not None and self.headers_fresh(now):
+            return max(local, 1 - self.remaining / self.limit)
+        return local
+
+
+class RateLimitGovernor:
+    """Per-endpoint token buckets kept in step with SE's rate-limit headers
+
+    Every call reserves a token before it is sent. Critical calls wait for
+    theirs; non-critical calls are shed instead when the endpoint is close
+    to its limit or would have to wait longer than max_wait. Responses feed
+    x-ratelimit-* headers back so the buckets track the server's view.
+    """
+
+    def __init__(self, rate=5, burst=10, shed_threshold=0.8, max_wait=2.0):
+        self.rate = rate
+        self.burst = burst
+        self.shed_threshold = shed_threshold
+        self.max_wait = max_wait
+        self.buckets = {}
+
+    def configure(self, rate=None, burst=None, shed_threshold=None, max_wait=None):
+        """Apply new limits, including to buckets already in use"""
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = burst
+        if shed_threshold is not None:
+            self.shed_threshold = shed_threshold
+        if max_wait is not None:
+            self.max_wait = max_wait
+        for bucket in self.buckets.values():
+            bucket.capacity = self.burst
+            bucket.tokens = min(bucket.tokens, self.burst)
+            # Buckets paced from server headers keep that pacing until the next response
+            if bucket.limit is None:
+                bucket.rate = self.rate
+
+    def _bucket(self, endpoint, now):
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            bucket = self.buckets[endpoint] = TokenBucket(self.rate, self.burst, now)
+        return bucket
+
+    async def acquire(self, endpoint, critical=True):
+        """Wait for a slot on the endpoint, or raise RateLimited for shed calls"""
+        now = time.monotonic()
+        bucket = self._bucket(endpoint, now)
+
+        if not critical:
+            if bucket.utilization(now) >= self.shed_threshold or bucket.delay(now) > self.max_wait:
+                bucket.shed += 1
+                raise RateLimited(f"Shed call to {endpoint}: rate limit nearly exhausted")
+
+        wait = bucket.reserve(now)
+        if wait > 0:
+            bucket.queued += 1
+            logger.debug(f"Throttling {endpoint} for {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update(self, endpoint, headers, now=None):
+        """Apply the server's x-ratelimit-* headers to the endpoint's bucket"""
+        now = time.monotonic() if now is None else now
+        limit = headers.get("x-ratelimit-limit")
+        remaining = headers.get("x-ratelimit-remaining")
+        if limit is None or remaining is None:
+            return
+        try:
+            limit = int(limit)
+            remaining = int(remaining)
+        except ValueError:
+            return
+
+        bucket = self._bucket(endpoint, now)
+        bucket.refill(now)
+        bucket.limit = limit
+        bucket.remaining = remaining
+        reset = parse_reset(headers.get("x-ratelimit-reset"))
+        bucket.synced_at = now
+        bucket.resets_at = None if reset is None else now + reset
+
+        # Never believe we have more headroom than the server says we do
+        bucket.tokens = min(bucket.tokens, remaining)
+        if reset is None:
+            return
+        if remaining <= 0:
+            bucket.blocked_until = now + reset
+            bucket.rate = self.rate
+        elif reset > 0:
+            # Spread what is left of the window evenly until it resets
+            bucket.blocked_until = 0.0
+            bucket.rate = min(self.rate, max(remaining / reset, 0.1))
+        else:
+            bucket.rate = self.rate
+
+    def throttle(self, endpoint, seconds, now=None):
+        """Hold all calls to the endpoint, e.g. after a 429 with Retry-After"""
+        now = time.monotonic() if now is None else now
+        bucket = self._bucket(endpoint, now)
+        bucket.blocked_until = max(bucket.blocked_until, now + seconds)
+
+    def utilization(self, endpoint=None, now=None):
+        """How close an endpoint, or the busiest endpoint, is to its limit"""
+        now = time.monotonic() if now is None else now
+        if endpoint is not None:
+            bucket = self.buckets.get(endpoint)
+            return bucket.utilization(now) if bucket else 0.0
+        return max((bucket.utilization(now) for bucket in self.buckets.values()), default=0.0)
+
+    def report(self, now=None):
+        """Quota usage per endpoint, suitable for logging"""
+        now = time.monotonic() if now is None else now
+        return {
+            endpoint: {
+                "utilization": round(bucket.utilization(now), 3),
+                "limit": bucket.limit,
+                "remaining": bucket.remaining,
+                "queued": bucket.queued,
+                "shed": bucket.shed,
+            }
+            for endpoint, bucket in self.buckets.items()
+        }
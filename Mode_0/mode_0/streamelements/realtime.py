@@ -0,0 +1,254 @@
+"""
+StreamElements realtime websocket client.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+import websockets
+from mode_0.streamelements.http_client import LatencyHistogram, StreamElementsError
+
+logger = logging.getLogger("mode_0.streamelements.realtime")
+
+
+def parse_timestamp(value):
+    """Parse an ISO-8601 timestamp from StreamElements into epoch seconds"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return None
+
+
+def normalize_event(activity):
+    """Convert a realtime or activity-feed event into the "-latest" shape handlers expect"""
+    event_type = activity.get("type")
+    if not event_type:
+        return None
+    return {
+        "type": event_type if event_type.endswith("-latest") else f"{event_type}-latest",
+        "_id": activity.get("_id") or activity.get("activityId"),
+        "createdAt": activity.get("createdAt"),
+        "data": activity.get("data", {}),
+        "provider": activity.get("provider"),
+    }
+
+
+class RealtimeClient:
+    """Socket.io client for realtime.streamelements.com
+
+    The reader task only sorts frames: heartbeats are answered in place and
+    everything else is queued raw for a separate decoder task, so JSON
+    decoding and event handling never delay socket reads. After a
+    disconnect the client reconnects with exponential backoff,
+    re-authenticates, and replays activities missed while it was away.
+    """
+
+    def __init__(self, url, jwt_token, on_event, http=None, channel_id=None,
+                 backoff_base=1.0, backoff_cap=60.0, replay_window=600, max_queue=1000):
+        self.url = url
+        self.jwt_token = jwt_token
+        self.on_event = on_event
+        self.http = http
+        self.channel_id = channel_id
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.replay_window = replay_window
+
+        self.ws = None
+        self.connected = False
+        self._frames = asyncio.Queue(maxsize=max_queue)
+        self._stopping = False
+        self._last_frame = 0.0
+        self._authenticated = None
+
+        # Time of the most recent event seen, used to replay after a reconnect
+        self.last_event_at = None
+
+        # Metrics
+        self.reconnects = 0
+        self.dropped_frames = 0
+        self.reconnect_time = LatencyHistogram()
+        self.event_lag = LatencyHistogram()
+
+    @property
+    def socket_url(self):
+        """Websocket URL with the socket.io query parameters"""
+        if "?" in self.url:
+            return self.url
+        return f"{self.url.rstrip('/')}/?EIO=3&transport=websocket"
+
+    async def run(self):
+        """Stay connected until stop() is called"""
+        decoder = asyncio.create_task(self._decode_frames())
+        attempt = 0
+        disconnected_at = None
+
+        try:
+            while not self._stopping:
+                try:
+                    async with websockets.connect(self.socket_url, ping_interval=None) as ws:
+                        self.ws = ws
+                        await self._session(ws, disconnected_at)
+                except (OSError, ValueError, websockets.WebSocketException,
+                        asyncio.TimeoutError, StreamElementsError) as e:
+                    logger.warning(f"StreamElements websocket error: {e}")
+                except Exception as e:
+                    # Anything unexpected still ends in a reconnect, never a dead client
+                    logger.exception(f"Unexpected StreamElements websocket error: {e}")
+                finally:
+                    if self.connected:
+                        disconnected_at = time.monotonic()
+                        attempt = 0
+                    self.ws = None
+                    self.connected = False
+
+                if self._stopping:
+                    break
+
+                # Reconnect quickly at first, backing off if failures continue
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+                attempt += 1
+                await asyncio.sleep(delay)
+        finally:
+            decoder.cancel()
+
+    async def _session(self, ws, disconnected_at):
+        """Run one connection from handshake to close"""
+        handshake = await asyncio.wait_for(ws.recv(), timeout=10)
+        if not isinstance(handshake, str) or not handshake.startswith("0"):
+            raise websockets.InvalidMessage(f"Unexpected handshake: {handshake[:50]!r}")
+        options = json.loads(handshake[1:])
+        if not isinstance(options, dict):
+            raise websockets.InvalidMessage(f"Unexpected handshake options: {handshake[:50]!r}")
+        self._last_frame = time.monotonic()
+        ping_interval = options.get("pingInterval", 25000) / 1000
+        ping_timeout = options.get("pingTimeout", 60000) / 1000
+
+        self._authenticated = asyncio.get_running_loop().create_future()
+        await ws.send("42" + json.dumps(["authenticate", {"method": "jwt", "token": self.jwt_token}]))
+
+        heartbeat = asyncio.create_task(self._heartbeat(ws, ping_interval, ping_timeout))
+        try:
+            reader = asyncio.create_task(self._read(ws))
+            await asyncio.wait_for(asyncio.shield(self._authenticated), timeout=10)
+            self.connected = True
+            logger.info("Connected to StreamElements realtime")
+
+            if disconnected_at is not None:
+                self.reconnects += 1
+                self.reconnect_time.observe(time.monotonic() - disconnected_at)
+                await self._replay_missed(time.monotonic() - disconnected_at)
+
+            await reader
+        finally:
+            heartbeat.cancel()
+            if not reader.done():
+                reader.cancel()
+
+    async def _read(self, ws):
+        """Answer heartbeats and queue everything else for decoding"""
+        async for frame in ws:
+            self._last_frame = time.monotonic()
+            # Engine.IO v3 text frames only; binary attachments aren't used by SE
+            if not isinstance(frame, str):
+                continue
+            if frame == "2":
+                await ws.send("3")
+            elif frame.startswith("4"):
+                try:
+                    self._frames.put_nowait(frame)
+                except asyncio.QueueFull:
+                    self.dropped_frames += 1
+            elif frame == "1":
+                break
+
+    async def _heartbeat(self, ws, interval, timeout):
+        """Send socket.io pings and drop the connection if the server goes silent"""
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_frame > interval + timeout:
+                logger.warning("StreamElements websocket heartbeat timed out")
+                await ws.close()
+                return
+            await ws.send("2")
+
+    async def _decode_frames(self):
+        """Decode queued frames and hand events to the handler"""
+        while True:
+            frame = await self._frames.get()
+            try:
+                await self._handle_frame(frame)
+            except Exception as e:
+                logger.error(f"Error handling StreamElements frame: {e}")
+
+    async def _handle_frame(self, frame):
+        """Handle one socket.io message frame"""
+        if not frame.startswith("42"):
+            return
+        payload = json.loads(frame[2:])
+        name, data = payload[0], payload[1] if len(payload) > 1 else None
+
+        if name == "authenticated":
+            if self._authenticated is not None and not self._authenticated.done():
+                self._authenticated.set_result(data)
+        elif name == "unauthorized":
+            logger.error(f"StreamElements realtime authentication failed: {data}")
+            if self._authenticated is not None and not self._authenticated.done():
+                self._authenticated.set_exception(StreamElementsError("Unauthorized"))
+        elif name == "event" and isinstance(data, dict):
+            await self._dispatch(data)
+
+    async def _dispatch(self, activity):
+        """Normalize an activity and pass it on"""
+        event = normalize_event(activity)
+        if event is None:
+            return
+
+        created = parse_timestamp(event["createdAt"])
+        if created is not None:
+            self.event_lag.observe(max(0.0, time.time() - created))
+            self.last_event_at = max(self.last_event_at or created, created)
+        await self.on_event(event)
+
+    async def _replay_missed(self, downtime):
+        """Fetch activities created while disconnected and dispatch them"""
+        if self.http is None or self.last_event_at is None or downtime > self.replay_window:
+            return
+
+        after = datetime.fromtimestamp(self.last_event_at, timezone.utc).isoformat()
+        try:
+            response = await self.http.get(
+                f"activities/{self.channel_id}",
+                endpoint="activities",
+                params={"after": after, "limit": 100}
+            )
+        except StreamElementsError as e:
+            logger.warning(f"Could not replay missed StreamElements events: {e}")
+            return
+
+        if not response.ok or not isinstance(response.data, list):
+            return
+        activities = sorted(response.data, key=lambda activity: activity.get("createdAt", ""))
+        for activity in activities:
+            await self._dispatch(activity)
+        logger.info(f"Replayed {len(activities)} StreamElements event(s) after reconnect")
+
+    def metrics(self):
+        """Connection and lag metrics"""
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "dropped_frames": self.dropped_frames,
+            "reconnect_time": self.reconnect_time.snapshot(),
+            "event_lag": self.event_lag.snapshot(),
+        }
+
+    async def stop(self):
+        """Disconnect and stop reconnecting"""
+        self._stopping = True
+        if self.ws is not None:
+            await self.ws.close()
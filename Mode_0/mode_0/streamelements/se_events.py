@@ -4,41 +4,100 @@ StreamElements event handlers.
 import json
 import logging
 import asyncio
+import random
+from mode_0.database.job_queue import JobQueue
+from mode_0.streamelements.aggregator import BurstAggregator
+from mode_0.streamelements.dedup import EventDeduplicator
+from mode_0.streamelements.dispatcher import EventDispatcher
 
 logger = logging.getLogger("mode_0.streamelements.events")
 
+# Event type -> (handler method, concurrency, queue size)
+EVENT_HANDLERS = {
+    "follower-latest": ("handle_follow", 1, 500),
+    "subscriber-latest": ("handle_subscription", 1, 500),
+    "tip-latest": ("handle_tip", 2, 100),
+    "host-latest": ("handle_host", 1, 50),
+    "raid-latest": ("handle_raid", 1, 50),
+    "redemption-latest": ("handle_redemption", 2, 200)
+}
+
 class StreamElementsEvents:
     """Handles StreamElements events from WebSocket"""
     
-    def __init__(self, bot):
+    def __init__(self, bot, dedup_path="data/se_seen_events.json", alerts=None,
+                 jobs_path="data/se_jobs.db", jobs=None):
         self.bot = bot
+        
+        # Follow trains and gift bombs become a few summary messages
+        persona = getattr(bot, "persona", None)
+        self.alerts = BurstAggregator(
+            self._send_chat,
+            responses=persona.responses if persona is not None else None,
+            **(alerts or {})
+        )
+        
+        # Events replayed after a reconnect must not be handled twice
+        self.dedup = EventDeduplicator(dedup_path)
+        self.dedup.load()
+        
+        # Each event type gets its own queue and workers
+        self.dispatcher = EventDispatcher()
+        for event_type, (method, concurrency, queue_size) in EVENT_HANDLERS.items():
+            self.dispatcher.register(event_type, getattr(self, method), concurrency, queue_size)
+        
+        # Redemptions are persisted so a restart never loses one
+        self.jobs = JobQueue(jobs_path, self._run_job, **(jobs or {}))
     
     async def handle_event(self, event_data):
         """Process StreamElements event"""
-        event_type = event_data.get("type")
+        if self.dedup.seen(event_data):
+            logger.debug(f"Skipping duplicate {event_data.get('type')} event")
+            return False
         
-        if event_type == "follower-latest":
-            await self.handle_follow(event_data)
-        elif event_type == "subscriber-latest":
-            await self.handle_subscription(event_data)
-        elif event_type == "tip-latest":
-            await self.handle_tip(event_data)
-        elif event_type == "host-latest":
-            await self.handle_host(event_data)
-        elif event_type == "raid-latest":
-            await self.handle_raid(event_data)
-        elif event_type == "redemption-latest":
-            await self.handle_redemption(event_data)
+        # Queued for the event type's workers; never waits on a handler
+        accepted = self.dispatcher.dispatch(event_data)
+        # Only remembered once queued, so a redelivery of a dropped event still gets through
+        if accepted:
+            self.dedup.record(event_data)
+        return accepted
+    
+    async def _run_job(self, job):
+        """Run a durable job; raising schedules a retry"""
+        if job.kind == "redemption":
+            await self._process_redemption(job.payload)
+        else:
+            logger.warning(f"Dropping job of unknown kind {job.kind}")
+    
+    async def save_state(self):
+        """Persist seen event ids without blocking the event loop"""
+        state = self.dedup.snapshot()
+        if state is not None:
+            await asyncio.to_thread(self.dedup.write, state)
+    
+    async def _send_chat(self, text):
+        """Send an alert message to chat"""
+        await self.bot.send_chat(text)
+    
+    @staticmethod
+    def _display_name(data, key="username"):
+        """Best available display name from event data"""
+        details = data.get("data", {})
+        return details.get("displayName") or details.get(key) or details.get("name")
     
     async def handle_follow(self, data):
         """Handle new follower"""
-        # Implementation to be added
-        pass
+        self.alerts.add("follow", self._display_name(data))
     
     async def handle_subscription(self, data):
         """Handle new subscription"""
-        # Implementation to be added
-        pass
+        details = data.get("data", {})
+        sender = details.get("sender")
+        if details.get("gifted") and sender:
+            # Gift bombs are aggregated per gifter
+            self.alerts.add("gift", sender, key=sender.lower())
+        else:
+            self.alerts.add("sub", self._display_name(data))
     
     async def handle_tip(self, data):
         """Handle new tip/donation"""
@@ -57,5 +116,14 @@ class StreamElementsEvents:
     
     async def handle_redemption(self, data):
         """Handle point redemption"""
-        # Implementation to be added
-        pass
+        # Only enqueued here; the slow work happens in the job queue's workers
+        self.jobs.enqueue("redemption", data, self.dedup.event_id(data))
+    
+    async def _process_redemption(self, data):
+        """Acknowledge a redemption in chat"""
+        details = data.get("data", {})
+        item = details.get("itemName") or details.get("redemption") or "a reward"
+        persona = getattr(self.bot, "persona", None)
+        templates = (persona.responses if persona is not None else {}).get("redemption_alerts")
+        template = random.choice(templates) if templates else "{username} redeemed {item}!"
+        await self._send_chat(template.format(username=self._display_name(data) or "Someone", item=item))
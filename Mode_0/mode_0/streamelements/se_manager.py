@@ -7,72 +7,252 @@ import json
 import logging
 import random
 import websockets
+from mode_0.streamelements.catalog_cache import CatalogCache
+from mode_0.streamelements.game_scheduler import GameScheduler
+from mode_0.streamelements.http_client import StreamElementsClient, StreamElementsError
+from mode_0.streamelements.loyalty import LoyaltyService
+from mode_0.streamelements.rate_limit import RateLimitGovernor
+from mode_0.streamelements.realtime import RealtimeClient
 
 logger = logging.getLogger("mode_0.streamelements")
 
+# Built-in StreamElements chat games by how they are played
+GAME_TYPES = {
+    "solo": ("roulette", "slots", "gamble"),
+    "group": ("heist", "bingo", "raffle"),
+    "duel": ("duel",)
+}
+
 class StreamElementsManager:
     """Handles all interactions with StreamElements API"""
     
-    def __init__(self, jwt_token, channel_id):
+    def __init__(self, jwt_token, channel_id, catalog_path="data/se_catalog.json", catalog_ttl=3600,
+                 games=None, loyalty=None, rate_limit=None,
+                 base_url="https://api.streamelements.com/kappa/v2",
+                 ws_url="wss://realtime.streamelements.com/socket.io"):
         self.jwt_token = jwt_token
         self.channel_id = channel_id
         self.headers = {
             'Authorization': f'Bearer {jwt_token}',
             'Content-Type': 'application/json'
         }
-        self.base_url = "https://api.streamelements.com/kappa/v2"
-        self.ws_url = "wss://realtime.streamelements.com/socket.io"
+        # Overridable so the bot can run against the local simulator
+        self.base_url = base_url
+        rate_limit = rate_limit or {}
+        self.limiter = RateLimitGovernor(
+            rate=rate_limit.get("rate", 5),
+            burst=rate_limit.get("burst", 10),
+            shed_threshold=rate_limit.get("shed_threshold", 0.8),
+            max_wait=rate_limit.get("max_wait", 2.0)
+        )
+        self.http = StreamElementsClient(self.base_url, self.headers, limiter=self.limiter)
+        self.ws_url = ws_url
         self.ws = None
-        self.connected = False
+        self.ws_task = None
+        
+        # Coroutine called with each realtime event, set by the bot
+        self.event_handler = None
+        
         self.commands = {}
         self.games = {
             "solo": [],
             "group": [],
             "duel": []
         }
+        self.catalog = CatalogCache(catalog_path, ttl=catalog_ttl)
+        
+        # Cooldown-aware game selection
+        games = games or {}
+        self.game_bet = games.get("bet", 10)
+        self.scheduler = GameScheduler(
+            self.games,
+            cooldowns=games.get("cooldowns"),
+            default_cooldown=games.get("default_cooldown", 60),
+            group_duration=games.get("group_duration", 120),
+            duel_cooldown=games.get("duel_cooldown", 600)
+        )
+        self._catalog_loaded = False
+        self._refresh_task = None
+        
+        # Cached loyalty points lookups
+        loyalty = loyalty or {}
+        self.loyalty = LoyaltyService(
+            self.http,
+            channel_id,
+            points_ttl=loyalty.get("points_ttl", 30),
+            leaderboard_ttl=loyalty.get("leaderboard_ttl", 60),
+            leaderboard_size=loyalty.get("leaderboard_size", 25)
+        )
         
         logger.info("StreamElements manager initialized")
     
+    def configure(self, games=None, loyalty=None, rate_limit=None):
+        """Apply changed settings to the running manager"""
+        if games is not None:
+            self.game_bet = games.get("bet", self.game_bet)
+            scheduler = self.scheduler
+            scheduler.cooldowns = games.get("cooldowns", scheduler.cooldowns) or {}
+            scheduler.default_cooldown = games.get("default_cooldown", scheduler.default_cooldown)
+            scheduler.group_duration = games.get("group_duration", scheduler.group_duration)
+            scheduler.duel_cooldown = games.get("duel_cooldown", scheduler.duel_cooldown)
+        if loyalty is not None:
+            self.loyalty.points.ttl = loyalty.get("points_ttl", self.loyalty.points.ttl)
+            self.loyalty.leaderboards.ttl = loyalty.get("leaderboard_ttl", self.loyalty.leaderboards.ttl)
+            self.loyalty.leaderboard_size = loyalty.get("leaderboard_size", self.loyalty.leaderboard_size)
+        if rate_limit is not None:
+            self.limiter.configure(**{
+                key: rate_limit[key]
+                for key in ("rate", "burst", "shed_threshold", "max_wait")
+                if key in rate_limit
+            })
+        logger.info("StreamElements settings updated")
+    
+    @property
+    def connected(self):
+        """Whether the realtime websocket is connected and authenticated"""
+        return self.ws is not None and self.ws.connected
+    
     async def connect(self):
         """Connect to StreamElements API and WebSocket"""
-        # Fetch available commands and games
-        await self.fetch_commands()
-        await self.fetch_games()
+        # Use the cached catalog straight away on first start
+        if not self._catalog_loaded:
+            cached = self.catalog.load()
+            if cached:
+                self.commands = cached.get("commands", {})
+                self.games = cached.get("games", self.games)
+                self.scheduler.load(self.games)
+            self._catalog_loaded = True
+        
+        # Fetch available commands and games, in the background if we already have some
+        if not self.commands:
+            await self.refresh_catalog()
+        elif not self.catalog.is_fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh_catalog())
         
         # Connect to WebSocket for real-time events
         await self.connect_websocket()
     
+    async def refresh_catalog(self):
+        """Revalidate the command catalog and update the on-disk cache"""
+        changed = await self.fetch_commands()
+        if changed is None:
+            return
+        if changed:
+            await self.fetch_games()
+        await self.catalog.save(self.commands, self.games)
+    
     async def fetch_commands(self):
-        """Fetch available commands from StreamElements"""
-        # Implementation to be added
-        pass
+        """Fetch available commands from StreamElements
+        
+        Returns True if the catalog changed, False if it was still current,
+        or None if the fetch failed.
+        """
+        headers = {}
+        if self.commands and self.catalog.etag:
+            headers["If-None-Match"] = self.catalog.etag
+        
+        try:
+            response = await self.http.get(
+                f"bot/commands/{self.channel_id}", endpoint="bot/commands", headers=headers
+            )
+        except StreamElementsError as e:
+            logger.error(f"Error fetching StreamElements commands: {e}")
+            return None
+        
+        if response.status == 304:
+            self.catalog.mark_validated()
+            logger.debug("StreamElements command catalog unchanged")
+            return False
+        
+        if not response.ok or not isinstance(response.data, list):
+            logger.error(f"Unexpected response fetching commands: {response.status}")
+            return None
+        
+        self.catalog.mark_validated(response.headers.get("ETag"))
+        self.commands = {
+            command["command"].lower(): command
+            for command in response.data
+            if command.get("command") and command.get("enabled", True)
+        }
+        logger.info(f"Loaded {len(self.commands)} StreamElements commands")
+        return True
     
     async def fetch_games(self):
         """Categorize commands into game types"""
-        # Implementation to be added
-        pass
+        games = {game_type: list(names) for game_type, names in GAME_TYPES.items()}
+        
+        # Custom commands named after a game type are treated as that game
+        for name in self.commands:
+            for game_type, names in GAME_TYPES.items():
+                if name not in games[game_type] and any(game in name for game in names):
+                    games[game_type].append(name)
+        
+        self.games = games
+        self.scheduler.load(games)
     
     async def connect_websocket(self):
         """Connect to StreamElements WebSocket"""
-        # Implementation to be added
-        pass
+        if self.ws_task is not None and not self.ws_task.done():
+            return
+        
+        self.ws = RealtimeClient(
+            self.ws_url,
+            self.jwt_token,
+            self._on_event,
+            http=self.http,
+            channel_id=self.channel_id
+        )
+        self.ws_task = asyncio.create_task(self.ws.run())
+    
+    async def _on_event(self, event):
+        """Pass a realtime event to the registered handler"""
+        if self.event_handler is not None:
+            await self.event_handler(event)
     
     async def execute_command(self, channel, command, *args):
         """Execute a StreamElements command in the channel"""
-        # Implementation to be added
-        pass
+        # SE commands are triggered by typing them in chat
+        text = " ".join([f"!{command}"] + [str(arg) for arg in args])
+        try:
+            await channel.send(text)
+        except Exception as e:
+            logger.error(f"Error executing StreamElements command {command}: {e}")
+            return False
+        return True
+    
+    async def close(self):
+        """Release network resources"""
+        if self.ws is not None:
+            await self.ws.stop()
+        if self.ws_task is not None:
+            self.ws_task.cancel()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        await self.http.close()
     
     async def play_solo_game(self, channel):
         """Select and play a random solo game"""
-        # Implementation to be added
-        pass
+        game = self.scheduler.acquire("solo")
+        if game is None:
+            logger.debug("No solo game off cooldown")
+            return None
+        await self.execute_command(channel, game, self.game_bet)
+        return game
     
     async def play_group_game(self, channel):
         """Select and play a random group game"""
-        # Implementation to be added
-        pass
+        game = self.scheduler.acquire("group")
+        if game is None:
+            logger.debug("Group game already running or on cooldown")
+            return None
+        await self.execute_command(channel, game, self.game_bet)
+        return game
     
     async def play_duel_game(self, channel, opponent):
         """Start a duel game with an opponent"""
-        # Implementation to be added
-        pass
+        game = self.scheduler.acquire("duel", opponent=opponent)
+        if game is None:
+            logger.debug(f"Duel with {opponent} not allowed yet")
+            return None
+        await self.execute_command(channel, game, f"@{opponent}", self.game_bet)
+        return game
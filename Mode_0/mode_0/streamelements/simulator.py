@@ -0,0 +1,342 @@
+"""
+Local stand-in for the StreamElements REST API and realtime websocket.
+"""
+import aiohttp
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from aiohttp import web
+from mode_0.streamelements.realtime import parse_timestamp
+
+logger = logging.getLogger("mode_0.streamelements.simulator")
+
+# Relative frequency of each event type in a storm
+DEFAULT_MIX = {
+    "follower": 10,
+    "subscriber": 3,
+    "tip": 1,
+    "raid": 0.2,
+    "redemption": 4
+}
+
+DEFAULT_COMMANDS = [
+    {"command": name, "enabled": True}
+    for name in ("points", "top", "roulette", "slots", "gamble", "heist", "bingo", "raffle", "duel")
+]
+
+
+def make_event(event_type, username=None, now=None):
+    """Build a realtime activity shaped like the ones StreamElements sends"""
+    now = time.time() if now is None else now
+    username = username or f"viewer{random.randint(1, 99999)}"
+    data = {"username": username, "displayName": username}
+    if event_type == "subscriber":
+        data.update(amount=1, tier="1000")
+        if random.random() < 0.3:
+            data.update(gifted=True, sender="generous_gifter")
+    elif event_type == "tip":
+        data.update(amount=round(random.uniform(1, 50), 2), currency="USD", message="Keep it up!")
+    elif event_type == "raid":
+        data.update(amount=random.randint(5, 500))
+    elif event_type == "redemption":
+        data.update(itemName=random.choice(["Hydrate", "Song request", "Emote only"]), message="")
+    return {
+        "_id": uuid.uuid4().hex,
+        "type": event_type,
+        "provider": "twitch",
+        "createdAt": datetime.fromtimestamp(now, timezone.utc).isoformat().replace("+00:00", "Z"),
+        "data": data
+    }
+
+
+class StreamElementsSimulator:
+    """Serves the REST and realtime endpoints the bot uses from one aiohttp app
+
+    Point StreamElementsManager at base_url and ws_url to run the whole SE
+    path offline. Events come from storm() or replay() and are broadcast to
+    every authenticated socket; they are also kept for the activities
+    endpoint so reconnect replay works as it does against the real API.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8089, channel_id="simulated", jwt_token=None,
+                 commands=None, rate_limit=300, rate_window=60, ping_interval=25,
+                 max_activities=5000, record_path=None):
+        self.host = host
+        self.port = port
+        self.channel_id = channel_id
+        self.jwt_token = jwt_token
+        self.commands = commands or DEFAULT_COMMANDS
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.ping_interval = ping_interval
+        self.max_activities = max_activities
+        self.record_path = record_path
+
+        self.sockets = set()
+        self.activities = []
+        self.points = {}
+        self.emitted = 0
+        self.requests = 0
+        self._window_start = time.time()
+        self._window_count = 0
+        self._runner = None
+        self._record = None
+
+        self.app = web.Application(middlewares=[self._rate_limit_middleware])
+        self.app.router.add_get("/socket.io/", self._socket)
+        self.app.router.add_get("/kappa/v2/bot/commands/{channel}", self._commands)
+        self.app.router.add_get("/kappa/v2/points/{channel}/top", self._top)
+        self.app.router.add_get("/kappa/v2/points/{channel}/{user}", self._user_points)
+        self.app.router.add_get("/kappa/v2/activities/{channel}", self._activities)
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/kappa/v2"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.port}/socket.io"
+
+    async def start(self):
+        """Start serving"""
+        if self.record_path:
+            self._record = open(self.record_path, "a")
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"StreamElements simulator listening on {self.base_url} and {self.ws_url}")
+
+    async def stop(self):
+        """Close sockets and stop serving"""
+        for ws in list(self.sockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._record is not None:
+            self._record.close()
+            self._record = None
+
+    @web.middleware
+    async def _rate_limit_middleware(self, request, handler):
+        """Count REST calls and send x-ratelimit-* headers like the real API"""
+        if request.path.startswith("/socket.io"):
+            return await handler(request)
+
+        now = time.time()
+        if now - self._window_start >= self.rate_window:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        self.requests += 1
+
+        reset = self._window_start + self.rate_window
+        remaining = max(0, self.rate_limit - self._window_count)
+        headers = {
+            "x-ratelimit-limit": str(self.rate_limit),
+            "x-ratelimit-remaining": str(remaining),
+            "x-ratelimit-reset": str(int(reset * 1000))
+        }
+        if self._window_count > self.rate_limit:
+            headers["Retry-After"] = str(max(1, int(reset - now)))
+            return web.json_response({"error": "Too Many Requests"}, status=429, headers=headers)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    async def _commands(self, request):
+        body = json.dumps(self.commands)
+        etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+    def _points_for(self, username):
+        username = username.lower()
+        if username not in self.points:
+            self.points[username] = random.randint(0, 10000)
+        return self.points[username]
+
+    async def _user_points(self, request):
+        username = request.match_info["user"].lower()
+        points = self._points_for(username)
+        ranked = sorted(self.points.values(), reverse=True)
+        return web.json_response({
+            "channel": request.match_info["channel"],
+            "username": username,
+            "points": points,
+            "pointsAlltime": points,
+            "rank": ranked.index(points) + 1
+        })
+
+    async def _top(self, request):
+        limit = int(request.query.get("limit", 25))
+        ranked = sorted(self.points.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return web.json_response({
+            "_total": len(self.points),
+            "users": [{"username": username, "points": points} for username, points in ranked]
+        })
+
+    async def _activities(self, request):
+        after = parse_timestamp(request.query.get("after")) or 0.0
+        limit = int(request.query.get("limit", 100))
+        recent = [activity for activity in self.activities
+                  if (parse_timestamp(activity["createdAt"]) or 0.0) > after]
+        return web.json_response(recent[-limit:])
+
+    async def _socket(self, request):
+        """Speak enough Engine.IO v3 / socket.io to satisfy RealtimeClient"""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_str("0" + json.dumps({
+            "sid": uuid.uuid4().hex,
+            "upgrades": [],
+            "pingInterval": self.ping_interval * 1000,
+            "pingTimeout": 60000
+        }))
+        await ws.send_str("40")
+
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                frame = msg.data
+                if frame == "2":
+                    await ws.send_str("3")
+                elif frame.startswith("42"):
+                    name, *args = json.loads(frame[2:])
+                    if name != "authenticate":
+                        continue
+                    token = args[0].get("token") if args and isinstance(args[0], dict) else None
+                    if self.jwt_token is not None and token != self.jwt_token:
+                        await ws.send_str("42" + json.dumps(["unauthorized", {"message": "invalid token"}]))
+                        continue
+                    await ws.send_str("42" + json.dumps(["authenticated", {"channelId": self.channel_id}]))
+                    self.sockets.add(ws)
+        finally:
+            self.sockets.discard(ws)
+        return ws
+
+    async def emit(self, activity):
+        """Broadcast one activity to every connected client"""
+        self.activities.append(activity)
+        if len(self.activities) > self.max_activities:
+            del self.activities[:len(self.activities) - self.max_activities]
+        if self._record is not None:
+            self._record.write(json.dumps(activity) + "\n")
+
+        frame = "42" + json.dumps(["event", activity])
+        for ws in list(self.sockets):
+            try:
+                await ws.send_str(frame)
+            except ConnectionError:
+                self.sockets.discard(ws)
+        self.emitted += 1
+
+    async def storm(self, rate=10, duration=10, mix=None):
+        """Emit random events at about rate per second for duration seconds"""
+        mix = mix or DEFAULT_MIX
+        types, weights = zip(*mix.items())
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            # Exponential gaps give the bursty arrivals of a real stream
+            await asyncio.sleep(random.expovariate(rate))
+            await self.emit(make_event(random.choices(types, weights)[0]))
+
+    async def replay(self, path, speed=1.0, fresh_ids=True):
+        """Re-emit a JSONL event log, keeping its timing scaled by speed
+
+        A speed of 0 sends everything as fast as possible. With fresh_ids
+        events get new ids and timestamps so de-duplication treats them as new.
+        """
+        # Read it all up front in case the log is also being recorded to
+        with open(path, "r") as f:
+            lines = [line for line in f if line.strip()]
+
+        previous = None
+        for line in lines:
+            activity = json.loads(line)
+            created = parse_timestamp(activity.get("createdAt"))
+            if speed > 0 and previous is not None and created is not None:
+                await asyncio.sleep(max(0.0, created - previous) / speed)
+            previous = created if created is not None else previous
+
+            if fresh_ids:
+                activity["_id"] = uuid.uuid4().hex
+                activity["createdAt"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            # Accept events already normalized to "-latest" types as well as raw activities
+            activity["type"] = activity.get("type", "").removesuffix("-latest")
+            await self.emit(activity)
+
+    async def drop_connections(self):
+        """Close every socket to exercise reconnect and replay"""
+        for ws in list(self.sockets):
+            await ws.close()
+
+
+def parse_mix(text):
+    """Parse "follower=10,tip=1" into a mix"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def _run(args):
+    simulator = StreamElementsSimulator(
+        host=args.host,
+        port=args.port,
+        channel_id=args.channel_id,
+        jwt_token=args.jwt,
+        rate_limit=args.rate_limit,
+        record_path=args.record
+    )
+    await simulator.start()
+    try:
+        # Give the bot a moment to connect before sending anything
+        await asyncio.sleep(args.delay)
+        if args.replay:
+            await simulator.replay(args.replay, speed=args.speed)
+        if args.rate > 0:
+            await simulator.storm(args.rate, args.duration, parse_mix(args.mix) if args.mix else None)
+        logger.info(f"Emitted {simulator.emitted} events, served {simulator.requests} API requests")
+        if args.stay:
+            await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local StreamElements simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--channel-id", default="simulated")
+    parser.add_argument("--jwt", help="Only accept this token")
+    parser.add_argument("--rate", type=float, default=0, help="Storm events per second")
+    parser.add_argument("--duration", type=float, default=30, help="Storm length in seconds")
+    parser.add_argument("--mix", help='Event weights, e.g. "follower=10,tip=1,raid=0.2"')
+    parser.add_argument("--replay", help="JSONL event log to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed, 0 for as fast as possible")
+    parser.add_argument("--record", help="Append emitted events to this JSONL file")
+    parser.add_argument("--rate-limit", type=int, default=300, help="REST calls allowed per minute")
+    parser.add_argument("--delay", type=float, default=5, help="Seconds to wait before sending events")
+    parser.add_argument("--stay", action="store_true", help="Keep serving after events are sent")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
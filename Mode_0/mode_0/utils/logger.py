@@ -1,14 +1,80 @@
 """
 Logging configuration for the Mode_0 bot.
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import time
 from datetime import datetime
 import colorlog
 
-def setup_logger(level=logging.INFO):
-    """Set up logging configuration"""
+# Listener thread for the current logging pipeline
+_listener = None
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that sheds low-priority records instead of blocking
+    
+    DEBUG records are dropped once the queue is half full and INFO records
+    once it is nearly full. Warnings and errors are only lost if the queue
+    is completely full. A count of dropped records is logged once the
+    queue has room again, at most every notice_interval seconds.
+    """
+    
+    def __init__(self, log_queue, debug_threshold=0.5, info_threshold=0.9, notice_interval=10):
+        super().__init__(log_queue)
+        self.debug_limit = int(log_queue.maxsize * debug_threshold)
+        self.info_limit = int(log_queue.maxsize * info_threshold)
+        self.notice_interval = notice_interval
+        self.dropped = 0
+        self._last_notice = 0.0
+    
+    def emit(self, record):
+        # Shed before prepare(), which formats the message and is the costly part
+        size = self.queue.qsize()
+        if (record.levelno <= logging.DEBUG and size >= self.debug_limit) or \
+                (record.levelno <= logging.INFO and size >= self.info_limit):
+            self.dropped += 1
+            return
+        super().emit(record)
+    
+    def enqueue(self, record):
+        size = self.queue.qsize()
+        now = time.monotonic()
+        if self.dropped and size < self.debug_limit and now - self._last_notice >= self.notice_interval:
+            dropped, self.dropped = self.dropped, 0
+            self._last_notice = now
+            notice = logging.makeLogRecord({
+                "name": "mode_0.utils.logger",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {dropped} log record(s) while logging was backed up"
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                self.dropped = dropped
+        
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def stop_logging():
+    """Flush queued records and stop the logging thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def setup_logger(level=logging.INFO, queue_size=10000):
+    """Set up logging configuration
+    
+    Callers only enqueue records; a background thread formats them and
+    writes to the console and log file.
+    """
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
     
@@ -20,6 +86,7 @@ def setup_logger(level=logging.INFO):
     logger.propagate = False
     
     # Clear existing handlers
+    stop_logging()
     if logger.handlers:
         logger.handlers.clear()
     
@@ -46,8 +113,15 @@ def setup_logger(level=logging.INFO):
     file_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     file_handler.setFormatter(file_format)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Only the queue handler runs on the caller's thread
+    global _listener
+    log_queue = queue.Queue(maxsize=queue_size)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     return logger
+
+atexit.register(stop_logging)
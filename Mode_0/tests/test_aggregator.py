@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from mode_0.streamelements.aggregator import BurstAggregator
+
+RESPONSES = {
+    "follow_alerts": ["Thanks {username}"],
+    "follow_burst_alerts": ["{count} followers: {names}"],
+    "follow_count_alerts": ["{count} new follower{plural}"],
+    "sub_alerts": ["Sub {username}"],
+    "sub_burst_alerts": ["{count} subs: {names}"],
+    "gift_alerts": ["{username} gifted {count} sub{plural}"],
+}
+
+
+def make_aggregator(**kwargs):
+    aggregator = BurstAggregator(AsyncMock(), responses=RESPONSES, window=10, **kwargs)
+    # Drive the windows by hand instead of through the background sender
+    aggregator._task = SimpleNamespace(done=lambda: False)
+    return aggregator
+
+
+def test_nothing_sent_until_window_closes():
+    aggregator = make_aggregator()
+    aggregator.add("follow", "alice", now=0)
+
+    assert aggregator.collect(now=5) == []
+    assert aggregator.collect(now=10) == ["Thanks alice"]
+    assert aggregator.buckets == {}
+
+
+def test_burst_becomes_one_summary_with_name_cap():
+    aggregator = make_aggregator(max_names=2)
+    for name in ["alice", "bob", "carol", "dave"]:
+        aggregator.add("follow", name, now=0)
+
+    assert aggregator.collect(now=10) == ["4 followers: alice, bob and 2 more"]
+
+
+def test_unnamed_alerts_fall_back_to_count():
+    aggregator = make_aggregator()
+    aggregator.add("follow", None, now=0)
+    assert aggregator.collect(now=10) == ["1 new follower"]
+
+    for _ in range(4):
+        aggregator.add("follow", None, now=20)
+    assert aggregator.collect(now=30) == ["4 new followers"]
+
+
+def test_partly_named_small_bucket_counts_everyone():
+    aggregator = make_aggregator()
+    aggregator.add("follow", "alice", now=0)
+    aggregator.add("follow", None, now=1)
+
+    assert aggregator.collect(now=10) == ["2 followers: alice and 1 more"]
+
+
+def test_gifts_grouped_per_gifter():
+    aggregator = make_aggregator()
+    aggregator.add("gift", "Alice", key="alice", now=0)
+    aggregator.add("gift", "Alice", key="alice", now=0)
+
+    assert aggregator.collect(now=10) == ["Alice gifted 2 subs"]
+
+
+def test_cap_defers_buckets_to_next_window():
+    aggregator = make_aggregator(max_messages_per_window=1)
+    aggregator.add("follow", "alice", now=0)
+    aggregator.add("sub", "bob", now=0)
+
+    assert aggregator.collect(now=10) == ["Thanks alice"]
+    assert aggregator.collect(now=15) == []
+    aggregator.add("sub", "carol", now=16)
+    assert aggregator.collect(now=20) == ["2 subs: bob, carol"]
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mode_0.streamelements.catalog_cache import CatalogCache
+from mode_0.streamelements.se_manager import StreamElementsManager
+
+
+@pytest.mark.asyncio
+async def test_saved_catalog_loads_with_etag(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    cache = CatalogCache(path)
+    cache.mark_validated('"v1"', now=1000.0)
+    await cache.save({"slots": {"command": "slots"}}, {"solo": ["slots"]})
+
+    reloaded = CatalogCache(path)
+    cached = reloaded.load()
+
+    assert cached["commands"] == {"slots": {"command": "slots"}}
+    assert reloaded.etag == '"v1"'
+    assert reloaded.fetched_at == 1000.0
+
+
+def test_ttl_expiry():
+    cache = CatalogCache(ttl=60)
+    cache.mark_validated(now=1000.0)
+
+    assert cache.is_fresh(now=1059.0)
+    assert not cache.is_fresh(now=1060.0)
+
+
+@pytest.mark.parametrize("content", ["{not json", "[]", ""])
+def test_corrupt_cache_is_ignored(tmp_path, content):
+    path = tmp_path / "catalog.json"
+    path.write_text(content)
+    cache = CatalogCache(str(path))
+
+    assert cache.load() is None
+    assert cache.etag is None
+
+
+def test_missing_cache_is_ignored(tmp_path):
+    assert CatalogCache(str(tmp_path / "missing.json")).load() is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_catalog_revalidated_with_304(tmp_path):
+    requests = []
+
+    async def commands(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(
+            [{"command": "Slots", "enabled": True}, {"command": "off", "enabled": False}],
+            headers={"ETag": '"v1"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/bot/commands/chan", commands)
+    server = TestServer(app)
+    await server.start_server()
+    path = str(tmp_path / "catalog.json")
+    manager = StreamElementsManager("jwt", "chan", catalog_path=path, base_url=str(server.make_url("")))
+    try:
+        await manager.refresh_catalog()
+        manager.catalog.fetched_at = 0.0
+        await manager.refresh_catalog()
+    finally:
+        await manager.http.close()
+        await server.close()
+
+    assert requests == [None, '"v1"']
+    assert list(manager.commands) == ["slots"]
+    assert "slots" in manager.games["solo"]
+    # The 304 refreshed the validation time on disk without refetching
+    with open(path) as f:
+        saved = json.load(f)
+    assert saved["etag"] == '"v1"'
+    assert saved["fetched_at"] > 0
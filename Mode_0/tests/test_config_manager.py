@@ -0,0 +1,217 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from mode_0.config.config_manager import ConfigManager
+
+
+def write_config(path, config):
+    path.write_text(json.dumps(config))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path, {"bot": {"command_prefix": "!", "auto_engage": True}, "database": {"flush_interval": 10}})
+    return path
+
+
+def count_writes(manager, monkeypatch):
+    writes = []
+    write = manager._write
+
+    def counting(text):
+        writes.append(json.loads(text))
+        return write(text)
+
+    monkeypatch.setattr(manager, "_write", counting)
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_saves_are_coalesced(config_path, monkeypatch):
+    manager = ConfigManager(str(config_path), save_delay=0.05, max_save_delay=1.0)
+    writes = count_writes(manager, monkeypatch)
+
+    for value in range(5):
+        manager.set("database.flush_interval", value)
+        manager.save()
+    await asyncio.sleep(0.2)
+
+    assert len(writes) == 1
+    assert json.loads(config_path.read_text())["database"]["flush_interval"] == 4
+
+
+@pytest.mark.asyncio
+async def test_continuous_edits_still_saved_by_max_delay(config_path, monkeypatch):
+    manager = ConfigManager(str(config_path), save_delay=0.1, max_save_delay=0.2)
+    writes = count_writes(manager, monkeypatch)
+
+    # Each save would push a plain debounce back forever
+    for value in range(12):
+        manager.set("database.flush_interval", value)
+        manager.save()
+        await asyncio.sleep(0.05)
+
+    assert len(writes) >= 2
+    await manager.flush()
+    assert json.loads(config_path.read_text())["database"]["flush_interval"] == 11
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_save(config_path):
+    manager = ConfigManager(str(config_path), save_delay=10, max_save_delay=10)
+    manager.set("bot.command_prefix", "?")
+    manager.save()
+
+    await manager.flush()
+
+    assert json.loads(config_path.read_text())["bot"]["command_prefix"] == "?"
+
+
+def test_write_syncs_before_replacing(config_path, monkeypatch):
+    manager = ConfigManager(str(config_path))
+    calls = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append("fsync"), fsync(fd)))
+    monkeypatch.setattr(os, "replace", lambda src, dst: (calls.append("replace"), replace(src, dst)))
+
+    manager.set("bot.command_prefix", "?")
+    manager.save()
+
+    assert calls[:2] == ["fsync", "replace"]
+    assert json.loads(config_path.read_text())["bot"]["command_prefix"] == "?"
+    assert not os.path.exists(f"{config_path}.tmp")
+
+
+def test_failed_write_leaves_original_intact(config_path, monkeypatch):
+    manager = ConfigManager(str(config_path))
+    original = config_path.read_text()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    manager.set("bot.command_prefix", "?")
+    with pytest.raises(OSError):
+        manager.save()
+
+    assert config_path.read_text() == original
+    assert not os.path.exists(f"{config_path}.tmp")
+
+
+@pytest.mark.asyncio
+async def test_watcher_ignores_own_writes(config_path, monkeypatch):
+    manager = ConfigManager(str(config_path), save_delay=0.01)
+    reloads = []
+    reload = manager.reload
+    monkeypatch.setattr(manager, "reload", lambda: reloads.append(True) or reload())
+    watcher = asyncio.create_task(manager.watch(interval=0.01))
+
+    try:
+        manager.set("bot.command_prefix", "?")
+        manager.save()
+        await manager.flush()
+        await asyncio.sleep(0.1)
+        assert reloads == []
+
+        # An edit made outside the bot is picked up
+        write_config(config_path, {"bot": {"command_prefix": "$", "auto_engage": True}})
+        await asyncio.sleep(0.1)
+        assert reloads == [True]
+        assert manager.get("bot.command_prefix") == "$"
+    finally:
+        watcher.cancel()
+
+
+def test_flattened_lookup(config_path):
+    manager = ConfigManager(str(config_path))
+
+    assert manager.get("bot.command_prefix") == "!"
+    assert manager.get("bot") == {"command_prefix": "!", "auto_engage": True}
+    assert manager.get("bot.missing", "default") == "default"
+
+
+def test_accessor_follows_set_and_reload(config_path):
+    manager = ConfigManager(str(config_path))
+    prefix = manager.accessor("bot.command_prefix", "!", str)
+    interval = manager.accessor("database.flush_interval", 10, float)
+
+    manager.set("bot.command_prefix", "?")
+    assert prefix.value == "?"
+
+    write_config(config_path, {"bot": {"command_prefix": "$"}, "database": {"flush_interval": 2}})
+    manager.reload()
+    assert prefix.value == "$"
+    assert interval.value == 2.0
+    assert manager.accessor("bot.command_prefix") is prefix
+
+
+def test_accessor_defaults_for_missing_or_bad_values(config_path):
+    manager = ConfigManager(str(config_path))
+    missing = manager.accessor("twitch.channel", "qwazi905")
+    interval = manager.accessor("database.flush_interval", 10, float)
+
+    assert missing.value == "qwazi905"
+    manager.set("database.flush_interval", "soon")
+    assert interval.value == 10
+
+
+def test_invalid_edits_keep_current_config(config_path):
+    manager = ConfigManager(str(config_path))
+    changes = []
+    manager.subscribe("", changes.append)
+
+    config_path.write_text("{not json")
+    assert not manager.reload()
+
+    # Existing settings must keep their type
+    write_config(config_path, {"bot": {"command_prefix": "!", "auto_engage": True}, "database": {"flush_interval": "ten"}})
+    assert not manager.reload()
+
+    assert manager.get("database.flush_interval") == 10
+    assert changes == []
+
+
+def test_subscribers_get_only_changed_keys(config_path):
+    manager = ConfigManager(str(config_path))
+    everything, bot, database = [], [], []
+    manager.subscribe("", everything.append)
+    manager.subscribe("bot", bot.append)
+    manager.subscribe("database", database.append)
+
+    write_config(config_path, {"bot": {"command_prefix": "?"}, "database": {"flush_interval": 10}})
+    assert manager.reload()
+
+    assert bot == [{
+        "bot": {"command_prefix": "?"},
+        "bot.command_prefix": "?",
+        "bot.auto_engage": None,
+    }]
+    assert everything == bot
+    assert database == []
+
+
+def test_reload_reaches_persona_settings(tmp_path, mock_db):
+    from mode_0.persona.persona_system import PersonaSystem
+
+    persona = PersonaSystem(mock_db)
+    path = tmp_path / "persona_config.json"
+    write_config(path, persona.config)
+    manager = ConfigManager(str(path))
+    manager.subscribe("", lambda changes: persona.reload_config(manager.config))
+
+    config = json.loads(path.read_text())
+    config["greetings"]["window"] = 5
+    config["mood"]["hype_rate"] = 40
+    config["conversations"]["inactivity_gap"] = 10
+    config["topic_tracking"]["top_k"] = 3
+    write_config(path, config)
+    assert manager.reload()
+
+    assert persona.greetings.window == 5
+    assert persona.mood_engine.hype_rate == 40
+    assert persona.conversations.inactivity_gap.total_seconds() == 10
+    assert persona.topic_tracker.top_k == 3
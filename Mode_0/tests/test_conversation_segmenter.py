@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mode_0.persona.conversation_segmenter import ConversationSegmenter
+
+
+def test_gap_starts_new_conversation(mock_db):
+    segmenter = ConversationSegmenter(mock_db, inactivity_gap=300)
+    start = datetime(2024, 1, 1, 12, 0)
+
+    first = segmenter.add_message("1", "hi", "chan", timestamp=start)
+    same = segmenter.add_message("1", "again", "chan", timestamp=start + timedelta(seconds=60))
+    later = segmenter.add_message("1", "back", "chan", timestamp=start + timedelta(seconds=600))
+
+    assert first is same
+    assert later is not first
+    assert len(first.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_close_all_flushes_open_conversations(mock_db):
+    mock_db.add_conversations = AsyncMock(return_value=[1, 2])
+    segmenter = ConversationSegmenter(mock_db)
+    now = datetime.now()
+    segmenter.add_message("1", "hi", "chan", timestamp=now)
+    segmenter.add_message("2", "hey", "chan", timestamp=now)
+
+    assert await segmenter.flush(now) == []
+
+    segmenter.close_all()
+    finished = await segmenter.flush(now)
+
+    assert sorted(c.id for c in finished) == [1, 2]
+    assert segmenter.open == {}
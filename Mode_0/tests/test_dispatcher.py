@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from mode_0.streamelements.dispatcher import EventDispatcher
+
+
+@pytest.mark.asyncio
+async def test_slow_type_does_not_delay_other_types():
+    dispatcher = EventDispatcher()
+    release = asyncio.Event()
+    handled = []
+
+    async def slow(event):
+        await release.wait()
+        handled.append(event["type"])
+
+    async def fast(event):
+        handled.append(event["type"])
+
+    dispatcher.register("tip-latest", slow)
+    dispatcher.register("follower-latest", fast)
+
+    dispatcher.dispatch({"type": "tip-latest"})
+    dispatcher.dispatch({"type": "follower-latest"})
+    await asyncio.wait_for(dispatcher.pools["follower-latest"].queue.join(), timeout=1)
+    assert handled == ["follower-latest"]
+
+    release.set()
+    assert await dispatcher.drain(timeout=1)
+    assert handled == ["follower-latest", "tip-latest"]
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_counters_per_type():
+    dispatcher = EventDispatcher()
+    release = asyncio.Event()
+
+    async def handler(event):
+        await release.wait()
+        if event.get("fail"):
+            raise RuntimeError("boom")
+
+    dispatcher.register("tip-latest", handler, concurrency=1, queue_size=2)
+    results = [
+        dispatcher.dispatch({"type": "tip-latest"}),
+        dispatcher.dispatch({"type": "tip-latest", "fail": True}),
+    ]
+    # The worker has taken the first event, so one more fits before the queue is full
+    await asyncio.sleep(0)
+    results += [dispatcher.dispatch({"type": "tip-latest"}), dispatcher.dispatch({"type": "tip-latest"})]
+    assert not dispatcher.dispatch({"type": "raid-latest"})
+
+    release.set()
+    assert await dispatcher.drain(timeout=1)
+    stats = dispatcher.stats()
+    await dispatcher.stop()
+
+    assert results == [True, True, True, False]
+    tips = stats["tip-latest"]
+    assert (tips["received"], tips["processed"], tips["failed"], tips["dropped"]) == (4, 2, 1, 1)
+    assert tips["latency"]["count"] == 3
+    assert stats["unknown"] == {"raid-latest": 1}
+
+
+@pytest.mark.asyncio
+async def test_drain_times_out_on_stuck_handler():
+    dispatcher = EventDispatcher()
+
+    async def stuck(event):
+        await asyncio.sleep(10)
+
+    dispatcher.register("tip-latest", stuck)
+    dispatcher.dispatch({"type": "tip-latest"})
+
+    assert not await dispatcher.drain(timeout=0.05)
+    await dispatcher.stop()
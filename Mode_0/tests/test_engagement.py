@@ -0,0 +1,53 @@
+import random
+
+from mode_0.persona.engagement import EngagementEngine, SlidingWindow, is_question
+from mode_0.persona.topic_matcher import TopicMatcher
+
+
+def make_engine(**config):
+    settings = {"general_chat_rate": 1.0, "max_replies_per_minute": 6}
+    settings.update(config)
+    return EngagementEngine(settings, TopicMatcher({}))
+
+
+def test_sliding_window_forgets_old_events():
+    window = SlidingWindow(60)
+    window.add(0)
+    window.add(30)
+    assert window.count(59) == 2
+    assert window.count(61) == 1
+
+
+def test_is_question():
+    assert is_question("anyone here?")
+    assert is_question("how do I join")
+    assert not is_question("hello there")
+
+
+def test_flood_never_exceeds_hard_ceiling():
+    random.seed(1)
+    engine = make_engine()
+    replies = []
+    # 1000 messages per second for two minutes
+    for i in range(120000):
+        now = i / 1000
+        if engine.decide("hello chat", topics={}, now=now):
+            replies.append(now)
+
+    for start in range(0, 61):
+        in_window = [t for t in replies if start <= t < start + 60]
+        assert len(in_window) <= 6
+
+
+def test_mentions_respect_hard_ceiling():
+    engine = make_engine(mention_response_rate=1.0)
+    approved = [engine.decide("hey bot", is_mentioned=True, now=i * 0.01) for i in range(100)]
+    assert sum(1 for kind in approved if kind) == 6
+
+
+def test_question_by_name_at_least_as_likely_as_mention(monkeypatch):
+    engine = make_engine(mention_response_rate=1.0, direct_question_rate=0.9)
+    monkeypatch.setattr("mode_0.persona.engagement.random.random", lambda: 0.95)
+
+    assert engine.decide("mode_0 what song is this?", is_mentioned=True, now=0) == "question"
+    assert engine.decide("hi mode_0", is_mentioned=True, now=1) == "mention"
@@ -0,0 +1,29 @@
+from mode_0.streamelements.game_scheduler import GameScheduler
+
+
+def test_cooldown_blocks_replay():
+    scheduler = GameScheduler({"solo": ["slots"]}, default_cooldown=60)
+
+    assert scheduler.acquire("solo", now=100.0) == "slots"
+    assert scheduler.acquire("solo", now=130.0) is None
+    assert scheduler.acquire("solo", now=160.0) == "slots"
+
+
+def test_reload_keeps_cooldowns():
+    scheduler = GameScheduler({"solo": ["slots"]}, default_cooldown=60)
+    assert scheduler.acquire("solo", now=100.0) == "slots"
+
+    scheduler.load({"solo": ["slots", "roulette"]})
+
+    # The new game is ready at once, the played one is still cooling down
+    assert scheduler.acquire("solo", now=110.0) == "roulette"
+    assert scheduler.acquire("solo", now=120.0) is None
+    assert scheduler.acquire("solo", now=160.0) == "slots"
+
+
+def test_duels_throttled_per_opponent():
+    scheduler = GameScheduler({"duel": ["duel"]}, default_cooldown=0, duel_cooldown=600)
+
+    assert scheduler.acquire("duel", opponent="Alice", now=100.0) == "duel"
+    assert scheduler.acquire("duel", opponent="alice", now=200.0) is None
+    assert scheduler.acquire("duel", opponent="bob", now=200.0) == "duel"
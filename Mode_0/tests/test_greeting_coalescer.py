@@ -0,0 +1,33 @@
+from mode_0.persona.greeting_coalescer import ExpiringSet, GreetingCoalescer
+
+
+def test_expiring_set_expires_after_ttl():
+    seen = ExpiringSet(ttl=10)
+    seen.add("a", now=0)
+    assert seen.contains("a", now=5)
+    assert not seen.contains("a", now=11)
+
+
+def test_active_chatter_is_not_regreeted():
+    coalescer = GreetingCoalescer(persona=None, greet_ttl=3600)
+    assert coalescer.add("1", "alice", now=0)
+
+    # Chatting every ten minutes for two hours keeps them known
+    for minute in range(10, 130, 10):
+        assert not coalescer.add("1", "alice", now=minute * 60)
+
+
+def test_user_away_longer_than_ttl_is_regreeted():
+    coalescer = GreetingCoalescer(persona=None, greet_ttl=3600)
+    coalescer.add("1", "alice", now=0)
+    coalescer.pending.clear()
+    coalescer._pending_ids.clear()
+    assert coalescer.add("1", "alice", now=3601)
+
+
+def test_overflow_counts_users_beyond_pending_cap():
+    coalescer = GreetingCoalescer(persona=None, max_pending=2)
+    for i in range(5):
+        coalescer.add(str(i), f"user{i}", now=0)
+    assert len(coalescer.pending) == 2
+    assert coalescer.overflow == 3
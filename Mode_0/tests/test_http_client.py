@@ -0,0 +1,153 @@
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mode_0.streamelements.http_client import StreamElementsClient, StreamElementsError
+
+
+@pytest_asyncio.fixture
+async def server():
+    calls = {"flaky": 0, "slow_retry": 0, "redeem": 0, "limited": 0}
+    peers = []
+
+    async def flaky(request):
+        # Fails once, then succeeds
+        calls["flaky"] += 1
+        if calls["flaky"] == 1:
+            return web.Response(status=503)
+        return web.json_response({"ok": True})
+
+    async def slow_retry(request):
+        calls["slow_retry"] += 1
+        if calls["slow_retry"] == 1:
+            return web.Response(status=503, headers={"Retry-After": "0.3"})
+        return web.json_response({"ok": True})
+
+    async def redeem(request):
+        calls["redeem"] += 1
+        return web.Response(status=503)
+
+    async def limited(request):
+        calls["limited"] += 1
+        if calls["limited"] == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"ok": True})
+
+    async def down(request):
+        return web.Response(status=503)
+
+    async def ping(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"pong": True})
+
+    app = web.Application()
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/slow_retry", slow_retry)
+    app.router.add_get("/down", down)
+    app.router.add_get("/ping", ping)
+    app.router.add_post("/redeem", redeem)
+    app.router.add_post("/limited", limited)
+
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    server.peers = peers
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    client = StreamElementsClient(str(server.make_url("")), {}, max_retries=2, backoff_base=0)
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_503_is_retried(server, client):
+    response = await client.get("flaky")
+
+    assert response.ok
+    assert response.data == {"ok": True}
+    assert server.calls["flaky"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured(server, client):
+    started = time.perf_counter()
+    response = await client.get("slow_retry")
+
+    assert response.ok
+    assert time.perf_counter() - started >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused(server, client):
+    await client.get("ping")
+    session = client._session
+    await client.get("ping")
+
+    assert client._session is session
+    # Kept-alive connection, so both calls came from the same client port
+    assert server.peers[0] == server.peers[1]
+
+
+@pytest.mark.asyncio
+async def test_histogram_counts_calls_and_errors(server, client):
+    await client.get("ping", endpoint="ping")
+    response = await client.get("down", endpoint="down")
+
+    assert response.status == 503
+    report = client.latency_report()
+    assert report["ping"]["count"] == 1
+    assert report["ping"]["errors"] == 0
+    # Every attempt is timed, only the final failure counts as an error
+    assert report["down"]["count"] == 3
+    assert report["down"]["errors"] == 1
+    assert report["down"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried(server, client):
+    response = await client.post("redeem")
+
+    assert response.status == 503
+    assert server.calls["redeem"] == 1
+    assert client.latency_report()["redeem"]["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_post_marked_idempotent_is_retried(server, client):
+    response = await client.post("redeem", idempotent=True)
+
+    assert response.status == 503
+    assert server.calls["redeem"] == 3
+
+
+@pytest.mark.asyncio
+async def test_post_retried_after_429(server, client):
+    response = await client.post("limited")
+
+    assert response.ok
+    assert server.calls["limited"] == 2
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_counted_once_per_request():
+    server = TestServer(web.Application())
+    await server.start_server()
+    url = str(server.make_url(""))
+    await server.close()
+
+    client = StreamElementsClient(url, {}, max_retries=2, backoff_base=0)
+    try:
+        with pytest.raises(StreamElementsError):
+            await client.get("ping")
+    finally:
+        await client.close()
+
+    report = client.latency_report()["ping"]
+    assert (report["count"], report["errors"], report["retries"]) == (3, 1, 2)
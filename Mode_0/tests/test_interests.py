@@ -0,0 +1,80 @@
+import pytest
+
+from mode_0.persona.interests import InterestExtractor
+
+DAY = 86400
+
+
+def test_rare_terms_outrank_common_ones():
+    extractor = InterestExtractor()
+    extractor.update("alice", ["techno", "music"], now=0)
+    extractor.update("alice", ["music"], now=1)
+    for i in range(20):
+        extractor.update(f"user{i}", ["music"] if i % 2 else ["beats"], now=2)
+
+    assert extractor.top_interests("alice") == ["techno", "music"]
+
+
+def test_terms_everyone_uses_are_dropped():
+    extractor = InterestExtractor()
+    extractor.update("alice", ["stream", "vinyl"], now=0)
+    extractor.update("bob", ["stream"], now=0)
+    extractor.update("alice", ["stream"], now=0)
+
+    assert "stream" not in extractor.top_interests("alice")
+    assert extractor.top_interests("bob") == []
+
+
+def test_recent_interests_outrank_old_ones():
+    extractor = InterestExtractor(half_life=7 * DAY)
+    for _ in range(3):
+        extractor.update("alice", ["trance"], now=0)
+    for _ in range(2):
+        extractor.update("alice", ["techno"], now=14 * DAY)
+    for i in range(5):
+        extractor.update(f"user{i}", ["chat"], now=14 * DAY)
+
+    # Three mentions two half-lives ago weigh less than two today
+    assert extractor.top_interests("alice") == ["techno", "trance"]
+
+
+def test_weights_decay_by_half_life():
+    extractor = InterestExtractor(half_life=DAY)
+    extractor.update("alice", ["old"], now=0)
+    extractor.update("alice", ["new"], now=DAY)
+    vector = extractor._users["alice"]
+
+    assert vector["new"] / vector["old"] == pytest.approx(2.0)
+
+
+def test_rescaling_keeps_ranking_over_long_gaps():
+    extractor = InterestExtractor(half_life=60)
+    extractor.update("alice", ["old"], now=0)
+    extractor.update("alice", ["old"], now=0)
+    extractor.update("bob", ["other"], now=0)
+    # Far enough ahead that the growth factor has to be rescaled
+    extractor.update("alice", ["new"], now=60 * 60)
+
+    assert extractor._epoch == 60 * 60
+    assert extractor.top_interests("alice", n=1) == ["new"]
+
+
+def test_least_recent_user_evicted():
+    extractor = InterestExtractor(max_users=2)
+    extractor.update("alice", ["house"], now=0)
+    extractor.update("bob", ["techno"], now=1)
+    extractor.update("alice", ["house"], now=2)
+    extractor.update("carol", ["trance"], now=3)
+
+    assert "alice" in extractor
+    assert "bob" not in extractor
+    assert "carol" in extractor
+
+
+def test_vectors_pruned_to_strongest_terms():
+    extractor = InterestExtractor(max_terms=2)
+    extractor.update("alice", ["keep", "keep", "also"], now=0)
+    extractor.update("alice", ["also"], now=0)
+    extractor.update("alice", ["one", "two", "three"], now=0)
+
+    assert set(extractor._users["alice"]) == {"keep", "also"}
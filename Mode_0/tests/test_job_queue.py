@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from mode_0.database.job_queue import JobQueue
+
+
+async def eventually(condition, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def rows(path):
+    with sqlite3.connect(path) as conn:
+        return {job_id: (status, attempts) for job_id, status, attempts in
+                conn.execute("SELECT id, status, attempts FROM jobs")}
+
+
+def make_queue(path, handler, **kwargs):
+    return JobQueue(str(path), handler, flush_interval=0.01, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_pending_jobs_recovered_after_restart(tmp_path):
+    path = tmp_path / "jobs.db"
+    handled = []
+
+    async def handler(job):
+        handled.append(job.id)
+
+    # No workers, so the jobs are persisted but never run
+    first = make_queue(path, handler, workers=0)
+    await first.start()
+    first.enqueue("redemption", {"item": "song"}, "a")
+    first.enqueue("redemption", {"item": "shoutout"}, "b")
+    await eventually(lambda: len(rows(path)) == 2)
+    await first.stop()
+
+    second = make_queue(path, handler)
+    await second.start()
+    await eventually(lambda: sorted(handled) == ["a", "b"])
+    await second.stop()
+    assert rows(path) == {"a": ("done", 0), "b": ("done", 0)}
+
+
+@pytest.mark.asyncio
+async def test_failing_job_retries_then_fails(tmp_path):
+    path = tmp_path / "jobs.db"
+    attempts = []
+
+    async def handler(job):
+        attempts.append(job.attempts)
+        raise RuntimeError("chat unavailable")
+
+    queue = make_queue(path, handler, max_attempts=3, backoff_base=0.001, backoff_cap=0.01)
+    await queue.start()
+    queue.enqueue("redemption", {}, "a")
+    await eventually(lambda: queue.failed == 1)
+    await queue.stop()
+
+    assert attempts == [0, 1, 2]
+    assert queue.retried == 2
+    assert rows(path) == {"a": ("failed", 3)}
+
+
+@pytest.mark.asyncio
+async def test_repeated_job_id_runs_once(tmp_path):
+    path = tmp_path / "jobs.db"
+    handled = []
+
+    async def handler(job):
+        handled.append(job.id)
+
+    queue = make_queue(path, handler)
+    await queue.start()
+    queue.enqueue("redemption", {}, "a")
+    queue.enqueue("redemption", {}, "a")
+    await eventually(lambda: queue.completed == 1)
+    # Still ignored once the first copy is done
+    queue.enqueue("redemption", {}, "a")
+    await asyncio.sleep(0.1)
+    await queue.stop()
+
+    assert handled == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_job_interrupted_mid_run_stays_pending(tmp_path):
+    path = tmp_path / "jobs.db"
+    started = asyncio.Event()
+
+    async def stuck(job):
+        started.set()
+        await asyncio.sleep(10)
+
+    first = make_queue(path, stuck)
+    await first.start()
+    first.enqueue("redemption", {}, "a")
+    await asyncio.wait_for(started.wait(), timeout=3)
+    await first.stop()
+    assert rows(path) == {"a": ("pending", 0)}
+
+    handled = []
+
+    async def handler(job):
+        handled.append(job.id)
+
+    second = make_queue(path, handler)
+    await second.start()
+    await eventually(lambda: handled == ["a"])
+    await second.stop()
@@ -0,0 +1,59 @@
+import logging
+import queue
+
+from mode_0.utils.logger import DroppingQueueHandler
+
+
+class CountingArg:
+    """Log argument that counts how often it is formatted"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+def make_logger(handler):
+    logger = logging.getLogger("mode_0.tests.logger")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_shed_records_are_never_formatted():
+    log_queue = queue.Queue(maxsize=10)
+    handler = DroppingQueueHandler(log_queue)
+    logger = make_logger(handler)
+    for _ in range(5):
+        log_queue.put_nowait(None)
+
+    arg = CountingArg()
+    logger.debug("skipped %s", arg)
+
+    assert handler.dropped == 1
+    assert arg.formatted == 0
+    assert log_queue.qsize() == 5
+
+
+def test_warnings_kept_and_drops_reported():
+    log_queue = queue.Queue(maxsize=10)
+    handler = DroppingQueueHandler(log_queue, notice_interval=0)
+    logger = make_logger(handler)
+    for _ in range(9):
+        log_queue.put_nowait(None)
+
+    logger.info("dropped")
+    logger.warning("kept")
+    assert handler.dropped == 1
+    assert log_queue.qsize() == 10
+
+    # Once the queue drains the drop count is reported before the next record
+    while not log_queue.empty():
+        log_queue.get_nowait()
+    logger.info("after")
+    messages = [log_queue.get_nowait().getMessage() for _ in range(2)]
+    assert messages == ["Dropped 1 log record(s) while logging was backed up", "after"]
+    assert handler.dropped == 0
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from mode_0.streamelements.loyalty import SingleFlightCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = SingleFlightCache(ttl=30)
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return {"points": 10}
+
+    results = await asyncio.gather(*(cache.get("alice", loader) for _ in range(5)))
+
+    assert loads == 1
+    assert all(result == {"points": 10} for result in results)
+    assert cache.coalesced == 4
+    assert await cache.get("alice", loader) == {"points": 10}
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_followers_and_is_not_cached():
+    cache = SingleFlightCache(ttl=30)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(cache.get("alice", loader) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.peek("alice") is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_load_to_follower():
+    cache = SingleFlightCache(ttl=30)
+    started = asyncio.Event()
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        if loads == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return {"points": 10}
+
+    leader = asyncio.create_task(cache.get("alice", loader))
+    await started.wait()
+    follower = asyncio.create_task(cache.get("alice", loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.wait_for(follower, timeout=1) == {"points": 10}
+    assert leader.cancelled()
+    assert loads == 2
+    assert "alice" not in cache._in_flight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_leaves_leader_running():
+    cache = SingleFlightCache(ttl=30)
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return {"points": 10}
+
+    leader = asyncio.create_task(cache.get("alice", loader))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get("alice", loader))
+    await asyncio.sleep(0)
+    follower.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+
+    release.set()
+    assert await leader == {"points": 10}
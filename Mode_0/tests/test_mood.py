@@ -0,0 +1,80 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mode_0.persona.mood import MoodEstimator, caps_ratio, count_emotes
+
+
+def feed(estimator, per_minute, minutes, text="nice mix", start=0.0, **signals):
+    """Send messages at a steady rate, returning the time of the last one"""
+    interval = 60 / per_minute
+    now = start
+    for i in range(int(per_minute * minutes)):
+        now = start + i * interval
+        estimator.observe(text, now=now, **signals)
+    return now
+
+
+def test_counters_halve_each_half_life():
+    estimator = MoodEstimator(half_life=120)
+    estimator.observe("hello", now=0)
+
+    assert estimator._decayed(120)["messages"] == pytest.approx(0.5)
+    assert estimator._decayed(240)["messages"] == pytest.approx(0.25)
+
+
+def test_steady_rate_converges():
+    estimator = MoodEstimator(half_life=120)
+    now = feed(estimator, per_minute=6, minutes=20)
+
+    assert estimator.message_rate(now) == pytest.approx(6, rel=0.1)
+
+
+@pytest.mark.parametrize("per_minute, expected", [(1, "quiet"), (5, "neutral"), (15, "active"), (40, "hype")])
+def test_mood_thresholds(per_minute, expected):
+    estimator = MoodEstimator(quiet_rate=2, active_rate=10, hype_rate=25)
+    now = feed(estimator, per_minute, minutes=20)
+
+    assert estimator.mood(now) == expected
+
+
+def test_expressive_active_chat_is_hype():
+    estimator = MoodEstimator(quiet_rate=2, active_rate=10, hype_rate=25)
+    now = feed(estimator, 20, minutes=20, text="LETS GOOO", emotes=3, keyword_hits=1)
+
+    assert estimator.energy(now) >= 0.7
+    assert estimator.mood(now) == "hype"
+
+
+def test_gaming_talk_sets_gaming_mood():
+    estimator = MoodEstimator()
+    now = feed(estimator, 5, minutes=20, text="slots time", gaming_hits=1)
+
+    assert estimator.mood(now) == "gaming"
+    assert estimator.starter_pool(now=now) == "gaming_starters"
+
+
+def test_chat_goes_quiet_after_it_stops():
+    estimator = MoodEstimator(half_life=120)
+    now = feed(estimator, 15, minutes=20)
+
+    assert estimator.mood(now + 600) == "quiet"
+
+
+def test_configure_keeps_counters():
+    estimator = MoodEstimator(active_rate=10)
+    feed(estimator, 15, minutes=20, start=time.monotonic() - 1200)
+    estimator.configure(active_rate=20)
+
+    assert estimator.active_rate == 20
+    assert estimator.message_rate() == pytest.approx(15, rel=0.2)
+
+
+def test_signal_helpers():
+    message = SimpleNamespace(tags={"emotes": "25:0-4,6-10/1902:12-16"})
+
+    assert count_emotes(message) == 3
+    assert count_emotes(SimpleNamespace(tags={})) == 0
+    assert caps_ratio("HYPE hype") == 0.5
+    assert caps_ratio("123") == 0.0
@@ -0,0 +1,63 @@
+import asyncio
+import copy
+from types import SimpleNamespace
+
+from mode_0.persona.persona_system import PersonaSystem
+
+
+def test_reload_applies_runtime_sections(mock_db):
+    persona = PersonaSystem(mock_db)
+    config = copy.deepcopy(persona.config)
+    config["greetings"].update({"window": 5, "regreet_after": 60})
+    config["mood"] = {"hype_rate": 40}
+    config["conversations"] = {"inactivity_gap": 10}
+    config["topic_tracking"] = {"window": 60, "buckets": 3}
+    tracker = persona.topic_tracker
+
+    persona.reload_config(config)
+
+    assert persona.greetings.window == 5
+    assert persona.greetings.greeted.ttl == 60
+    assert persona.mood_engine.hype_rate == 40
+    assert persona.conversations.inactivity_gap.total_seconds() == 10
+    assert persona.topic_tracker is not tracker
+    assert persona.profiler.topic_tracker is persona.topic_tracker
+
+
+def test_reload_keeps_topic_counts_when_unchanged(mock_db):
+    persona = PersonaSystem(mock_db)
+    tracker = persona.topic_tracker
+
+    persona.reload_config(copy.deepcopy(persona.config))
+
+    assert persona.topic_tracker is tracker
+
+
+def make_message(content):
+    return SimpleNamespace(content=content, tags={})
+
+
+def test_chat_noise_is_not_tracked(mock_db):
+    persona = PersonaSystem(mock_db)
+    for content in ["hey chat", "hello everyone LUL", "PogChamp that track", "hey guys KEKW"]:
+        persona.observe_message(make_message(content))
+
+    topics = persona.conversation_topics
+    assert "hey" not in topics
+    assert "chat" not in topics
+    assert "kekw" not in topics
+    assert topics.get("track") == 1
+
+
+def test_starter_needs_enough_mentions(mock_db, monkeypatch):
+    persona = PersonaSystem(mock_db)
+    persona.responses["topic_starters"] = ["all about {topic}"]
+    monkeypatch.setattr("mode_0.persona.persona_system.random.random", lambda: 0.0)
+
+    persona.observe_message(make_message("vinyl"))
+    starter = asyncio.run(persona.get_conversation_starter("neutral"))
+    assert starter != "all about vinyl"
+
+    for _ in range(5):
+        persona.observe_message(make_message("vinyl"))
+    assert asyncio.run(persona.get_conversation_starter("neutral")) == "all about vinyl"
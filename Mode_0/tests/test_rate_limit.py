@@ -0,0 +1,118 @@
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mode_0.streamelements.http_client import StreamElementsClient
+from mode_0.streamelements.rate_limit import RateLimited, RateLimitGovernor, parse_reset
+
+
+def headers(limit, remaining, reset=None):
+    values = {"x-ratelimit-limit": str(limit), "x-ratelimit-remaining": str(remaining)}
+    if reset is not None:
+        values["x-ratelimit-reset"] = str(reset)
+    return values
+
+
+def test_parse_reset_accepts_deltas_and_epochs():
+    assert parse_reset("30", now=1000.0) == 30.0
+    assert parse_reset(str(1_700_000_030), now=1_700_000_000) == 30.0
+    assert parse_reset(str(1_700_000_030_000), now=1_700_000_000) == 30.0
+    assert parse_reset("soon") is None
+
+
+def test_headers_sync_bucket():
+    governor = RateLimitGovernor(rate=5, burst=10)
+    governor.update("points", headers(100, 4, reset=20), now=0.0)
+    bucket = governor.buckets["points"]
+
+    assert bucket.tokens == 4
+    assert bucket.rate == pytest.approx(4 / 20)
+    assert governor.utilization("points", now=1.0) == pytest.approx(0.96)
+
+
+def test_low_remaining_counts_until_reset():
+    governor = RateLimitGovernor(rate=5, burst=10)
+    governor.update("points", headers(100, 5, reset=30), now=0.0)
+
+    # Not blocked, but the server says the quota is nearly gone
+    assert governor.buckets["points"].blocked_until == 0.0
+    assert governor.utilization(now=10.0) >= 0.95
+    # Once the window resets only local usage counts
+    assert governor.utilization(now=60.0) < 0.5
+
+
+def test_reported_quota_without_reset_expires():
+    governor = RateLimitGovernor(rate=5, burst=10)
+    governor.update("points", headers(100, 5), now=0.0)
+
+    assert governor.utilization(now=30.0) >= 0.95
+    assert governor.utilization(now=120.0) < 0.5
+
+
+def test_exhausted_quota_blocks_until_reset():
+    governor = RateLimitGovernor(rate=5, burst=10)
+    governor.update("points", headers(100, 0, reset=2), now=0.0)
+    bucket = governor.buckets["points"]
+
+    assert bucket.delay(0.5) == pytest.approx(1.5)
+    assert bucket.delay(2.5) == 0.0
+
+
+def test_throttle_holds_endpoint():
+    governor = RateLimitGovernor()
+    governor.throttle("points", 3.0, now=10.0)
+
+    assert governor.buckets["points"].delay(11.0) == pytest.approx(2.0)
+    assert governor.buckets["points"].delay(13.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_non_critical_calls_are_shed_near_limit():
+    governor = RateLimitGovernor(rate=0.01, burst=10, shed_threshold=0.8)
+    for _ in range(9):
+        await governor.acquire("points")
+
+    with pytest.raises(RateLimited):
+        await governor.acquire("points", critical=False)
+    assert governor.buckets["points"].shed == 1
+
+    # Critical calls still go through
+    await governor.acquire("points")
+    assert governor.report()["points"]["shed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_critical_calls_shed_when_wait_too_long():
+    governor = RateLimitGovernor(shed_threshold=1.1, max_wait=1.0)
+    governor.throttle("points", 5.0)
+
+    with pytest.raises(RateLimited):
+        await governor.acquire("points", critical=False)
+
+
+@pytest.mark.asyncio
+async def test_429_retry_after_throttles_endpoint():
+    calls = []
+
+    async def points(request):
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return web.json_response({"points": 10})
+
+    app = web.Application()
+    app.router.add_get("/points/alice", points)
+    server = TestServer(app)
+    await server.start_server()
+    client = StreamElementsClient(str(server.make_url("")), {}, backoff_base=0)
+    try:
+        response = await client.get("points/alice", endpoint="points")
+    finally:
+        await client.close()
+        await server.close()
+
+    assert response.ok
+    assert calls[1] - calls[0] >= 0.3
+    assert client.limiter.buckets["points"].blocked_until > 0
@@ -0,0 +1,189 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mode_0.streamelements.http_client import APIResponse
+from mode_0.streamelements.realtime import RealtimeClient
+
+
+def activity(activity_id, created_at, name="alice"):
+    return {"_id": activity_id, "type": "follower", "createdAt": created_at, "data": {"username": name}}
+
+
+async def handshake(ws, ping_interval=25000, ping_timeout=60000):
+    """Send the Engine.IO handshake and accept the client's authentication"""
+    await ws.send_str("0" + json.dumps({"sid": "test", "pingInterval": ping_interval, "pingTimeout": ping_timeout}))
+    async for msg in ws:
+        if msg.data.startswith("42") and "authenticate" in msg.data:
+            await ws.send_str("42" + json.dumps(["authenticated", {"channelId": "chan"}]))
+            return
+
+
+async def hold_open(ws):
+    """Answer pings until the client goes away"""
+    async for msg in ws:
+        if msg.data == "2":
+            await ws.send_str("3")
+
+
+async def emit(ws, event):
+    await ws.send_str("42" + json.dumps(["event", event]))
+
+
+class FakeSocketServer:
+    """Socket.io endpoint that runs one script per incoming connection"""
+
+    def __init__(self, scripts):
+        self.scripts = scripts
+        self.connections = 0
+        app = web.Application()
+        app.router.add_get("/socket.io/", self._socket)
+        self.server = TestServer(app)
+
+    async def _socket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        script = self.scripts[min(self.connections, len(self.scripts) - 1)]
+        self.connections += 1
+        await script(ws)
+        return ws
+
+    @property
+    def url(self):
+        return str(self.server.make_url("/socket.io")).replace("http://", "ws://")
+
+
+@pytest_asyncio.fixture
+async def start_client():
+    started = []
+
+    async def start(scripts, **kwargs):
+        fake = FakeSocketServer(scripts)
+        await fake.server.start_server()
+        events = []
+
+        async def on_event(event):
+            events.append(event)
+
+        client = RealtimeClient(fake.url, "token", on_event, backoff_base=0.01, backoff_cap=0.05, **kwargs)
+        task = asyncio.create_task(client.run())
+        started.append((fake, client, task))
+        return fake, client, events
+
+    yield start
+    for fake, client, task in started:
+        await client.stop()
+        await asyncio.wait_for(task, timeout=2)
+        await fake.server.close()
+
+
+async def eventually(condition, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_disconnect(start_client):
+    async def first(ws):
+        await handshake(ws)
+        await emit(ws, activity("a", "2024-01-01T12:00:00Z"))
+        await ws.close()
+
+    async def second(ws):
+        await handshake(ws)
+        await emit(ws, activity("b", "2024-01-01T12:01:00Z"))
+        await hold_open(ws)
+
+    fake, client, events = await start_client([first, second])
+
+    await eventually(lambda: len(events) == 2)
+    assert [event["_id"] for event in events] == ["a", "b"]
+    assert events[0]["type"] == "follower-latest"
+    assert client.reconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_binary_frame_is_ignored(start_client):
+    async def script(ws):
+        await handshake(ws)
+        await ws.send_bytes(b"\x04binary")
+        await emit(ws, activity("a", "2024-01-01T12:00:00Z"))
+        await hold_open(ws)
+
+    fake, client, events = await start_client([script])
+
+    await eventually(lambda: len(events) == 1)
+    assert fake.connections == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bad_handshake", ["0[1, 2]", b"0{}"])
+async def test_bad_handshake_reconnects(start_client, bad_handshake):
+    async def broken(ws):
+        if isinstance(bad_handshake, bytes):
+            await ws.send_bytes(bad_handshake)
+        else:
+            await ws.send_str(bad_handshake)
+        await hold_open(ws)
+
+    async def healthy(ws):
+        await handshake(ws)
+        await hold_open(ws)
+
+    fake, client, events = await start_client([broken, healthy])
+
+    await eventually(lambda: client.connected)
+    assert fake.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_missed_events_replayed_after_reconnect(start_client):
+    class FakeHTTP:
+        def __init__(self):
+            self.calls = []
+
+        async def get(self, path, endpoint=None, **kwargs):
+            self.calls.append((path, kwargs["params"]))
+            return APIResponse(200, [activity("missed", "2024-01-01T12:00:30Z")], {})
+
+    async def first(ws):
+        await handshake(ws)
+        await emit(ws, activity("a", "2024-01-01T12:00:00Z"))
+        await ws.close()
+
+    async def second(ws):
+        await handshake(ws)
+        await hold_open(ws)
+
+    http = FakeHTTP()
+    fake, client, events = await start_client([first, second], http=http, channel_id="chan")
+
+    await eventually(lambda: len(events) == 2)
+    assert [event["_id"] for event in events] == ["a", "missed"]
+    path, params = http.calls[0]
+    assert path == "activities/chan"
+    assert params["after"].startswith("2024-01-01T12:00:00")
+
+
+@pytest.mark.asyncio
+async def test_silent_server_times_out_and_reconnects(start_client):
+    async def silent(ws):
+        # Never answers pings, so the client's heartbeat gives up
+        await handshake(ws, ping_interval=50, ping_timeout=50)
+        async for _ in ws:
+            pass
+
+    async def healthy(ws):
+        await handshake(ws)
+        await hold_open(ws)
+
+    fake, client, events = await start_client([silent, healthy])
+
+    await eventually(lambda: fake.connections == 2 and client.connected)
+    assert client.reconnects == 1
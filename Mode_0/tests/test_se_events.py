@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mode_0.streamelements.dedup import EventDeduplicator
+from mode_0.streamelements.se_events import StreamElementsEvents
+
+
+@pytest.fixture
+def events(tmp_path):
+    bot = SimpleNamespace(send_chat=AsyncMock())
+    return StreamElementsEvents(
+        bot,
+        dedup_path=str(tmp_path / "seen.json"),
+        jobs_path=str(tmp_path / "jobs.db")
+    )
+
+
+def test_fallback_id_includes_created_at():
+    first = {"type": "tip-latest", "data": {"amount": 5}, "createdAt": "2024-01-01T12:00:00Z"}
+    second = {"type": "tip-latest", "data": {"amount": 5}, "createdAt": "2024-01-01T12:05:00Z"}
+
+    assert EventDeduplicator.event_id(first) != EventDeduplicator.event_id(second)
+    assert EventDeduplicator.event_id(first) == EventDeduplicator.event_id(dict(first))
+
+
+@pytest.mark.asyncio
+async def test_duplicate_is_skipped(events):
+    event = {"_id": "abc", "type": "follower-latest", "data": {"username": "alice"}}
+    events.dispatcher.dispatch = lambda event: True
+
+    assert await events.handle_event(event) is True
+    assert await events.handle_event(event) is False
+    assert events.dedup.duplicates == 1
+
+
+@pytest.mark.asyncio
+async def test_dropped_event_is_not_recorded(events):
+    event = {"_id": "abc", "type": "follower-latest", "data": {"username": "alice"}}
+    events.dispatcher.dispatch = lambda event: False
+    assert await events.handle_event(event) is False
+
+    # A redelivery after the queue drained is handled
+    events.dispatcher.dispatch = lambda event: True
+    assert await events.handle_event(event) is True
+    assert events.dedup.duplicates == 0
@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mode_0.database.models import Conversation, Message
+from mode_0.persona.summarizer import SummaryPipeline, summarize_conversation
+
+
+def test_short_conversation_is_joined():
+    assert summarize_conversation(["hi", "  ", "how are you"]) == "hi | how are you"
+
+
+def test_summary_keeps_original_order():
+    lines = ["that drop was huge", "what song is this", "the drop at the end was huge", "lol"]
+    assert summarize_conversation(lines) == "that drop was huge | the drop at the end was huge"
+
+
+@pytest.mark.asyncio
+async def test_close_drains_queue_and_stops_workers(mock_db):
+    mock_db.update_conversation_summaries = AsyncMock()
+    pipeline = SummaryPipeline(mock_db)
+    now = datetime.now()
+    pipeline.submit([Conversation(7, now, now, "1", None, [
+        Message(None, "1", "hello", "chan", now)
+    ])])
+
+    runner = asyncio.create_task(pipeline.run())
+    await pipeline.close(timeout=30)
+    runner.cancel()
+
+    mock_db.update_conversation_summaries.assert_awaited_once_with([(7, "hello")])
+    assert pipeline._executor is None
@@ -0,0 +1,55 @@
+from mode_0.persona.topic_matcher import TopicMatcher, normalize_text, tokenize
+
+
+def test_multi_word_phrase_matches_across_punctuation():
+    matcher = TopicMatcher({"preferred": ["hard house"]})
+
+    assert matcher.scan("loving this HARD-HOUSE set!") == {"preferred": ["hard house"]}
+    assert matcher.scan("hard times in this house") == {}
+
+
+def test_overlapping_patterns_all_reported():
+    matcher = TopicMatcher({"preferred": ["house", "hard house", "house music"]})
+
+    assert matcher.scan("hard house music") == {"preferred": ["hard house", "house", "house music"]}
+
+
+def test_phrase_in_several_categories():
+    matcher = TopicMatcher({"preferred": ["dj"], "engagement_boost": ["dj", "new release"]})
+
+    assert matcher.scan("the dj has a new release") == {
+        "preferred": ["dj"],
+        "engagement_boost": ["dj", "new release"],
+    }
+
+
+def test_whole_words_only():
+    matcher = TopicMatcher({"preferred": ["dj"], "gaming": ["duel"]})
+
+    assert matcher.scan("adjust the duels") == {}
+    assert matcher.scan("dj") == {"preferred": ["dj"]}
+
+
+def test_failure_links_recover_partial_matches():
+    matcher = TopicMatcher({"preferred": ["new release", "release party"]})
+
+    assert matcher.scan("new release party") == {"preferred": ["new release", "release party"]}
+
+
+def test_repeats_reported_once_in_first_seen_order():
+    matcher = TopicMatcher({"gaming": ["slots", "heist"]})
+
+    assert matcher.scan("heist then slots then heist") == {"gaming": ["heist", "slots"]}
+
+
+def test_from_config_skips_non_lists():
+    matcher = TopicMatcher.from_config({"preferred": ["music"], "weights": {"music": 2}})
+
+    assert matcher.scan("music") == {"preferred": ["music"]}
+    assert TopicMatcher().scan("music") == {}
+
+
+def test_emote_codes_split_on_case():
+    assert normalize_text("qwazi905Hype LETS go") == "qwazi905 hype lets go"
+    assert TopicMatcher({"engagement_boost": ["qwazi905"]}).scan("qwazi905Hype") == {"engagement_boost": ["qwazi905"]}
+    assert tokenize("the 905 dj is in the house") == ["house"]
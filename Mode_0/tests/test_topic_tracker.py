@@ -0,0 +1,56 @@
+import math
+
+from mode_0.persona.topic_tracker import CountMinSketch, SpaceSaving, TopicTracker
+
+
+def test_count_min_never_undercounts_and_overcount_is_bounded():
+    sketch = CountMinSketch(width=512, depth=4)
+    total = 0
+    for i in range(1000):
+        sketch.add(f"word{i}")
+        total += 1
+    sketch.add("hot", count=50)
+    total += 50
+
+    assert all(sketch.estimate(f"word{i}") >= 1 for i in range(1000))
+    # Standard bound: overcount <= e * N / width with probability 1 - e^-depth
+    bound = math.e * total / 512
+    assert 50 <= sketch.estimate("hot") <= 50 + bound
+    overcounts = [sketch.estimate(f"word{i}") - 1 for i in range(1000)]
+    assert sum(overcount > bound for overcount in overcounts) <= 1000 * math.exp(-4)
+    # Rows hash independently, so most keys find at least one cell to themselves
+    assert sum(overcount == 0 for overcount in overcounts) > 300
+
+
+def test_space_saving_evicts_smallest_and_keeps_error_bound():
+    heavy = SpaceSaving(capacity=2)
+    heavy.add("a", 5)
+    heavy.add("b", 1)
+    heavy.add("c")
+
+    assert set(heavy.keys()) == {"a", "c"}
+    # The newcomer inherits the evicted count, so it is never undercounted
+    assert heavy.counts["c"] == 2
+    assert heavy.counts["a"] == 5
+
+
+def test_tracker_ranks_topics():
+    tracker = TopicTracker(window=60, buckets=6, top_k=2)
+    for now in range(10):
+        tracker.add({"techno"}, now=now)
+    for now in range(3):
+        tracker.add({"vinyl"}, now=now)
+    tracker.add({"drums"}, now=5)
+
+    assert tracker.top(now=10) == [("techno", 10), ("vinyl", 3)]
+    assert tracker.trending(min_count=5, now=10) == {"techno"}
+
+
+def test_tracker_forgets_topics_outside_window():
+    tracker = TopicTracker(window=60, buckets=6)
+    tracker.add({"techno"}, now=0)
+    tracker.add({"vinyl"}, now=50)
+
+    assert dict(tracker.top(now=65)) == {"techno": 1, "vinyl": 1}
+    assert dict(tracker.top(now=100)) == {"vinyl": 1}
+    assert tracker.top(now=200) == []
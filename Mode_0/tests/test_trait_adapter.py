@@ -0,0 +1,88 @@
+import pytest
+
+from mode_0.persona.trait_adapter import TraitAdapter
+
+BASE = {"friendly": 0.8, "humor": 0.7, "helpfulness": 0.9, "edginess": 0.5}
+
+
+def test_tick_without_feedback_changes_nothing():
+    adapter = TraitAdapter(BASE)
+
+    assert not adapter.tick()
+    assert adapter.as_dict() == BASE
+
+
+def test_feedback_mix_not_volume_drives_update():
+    small = TraitAdapter(BASE, learning_rate=0.1, reversion=0)
+    large = TraitAdapter(BASE, learning_rate=0.1, reversion=0)
+    small.record("emote_reaction")
+    large.record("emote_reaction", count=1000)
+    small.tick()
+    large.tick()
+
+    assert small.as_dict() == large.as_dict()
+    assert small.as_dict()["humor"] == pytest.approx(0.7 + 0.1 * 0.6)
+
+
+def test_traits_stay_within_bounds():
+    adapter = TraitAdapter(BASE, learning_rate=1.0, reversion=0)
+    for _ in range(20):
+        adapter.record("ignored")
+        adapter.tick()
+    assert all(trait >= 0.0 for trait in adapter.traits)
+    assert adapter.as_dict()["edginess"] == 0.0
+
+    for _ in range(20):
+        adapter.record("reply")
+        adapter.tick()
+    assert all(trait <= 1.0 for trait in adapter.traits)
+
+
+def test_reversion_pulls_back_toward_base():
+    adapter = TraitAdapter(BASE, learning_rate=0.5, reversion=1.0)
+    adapter.traits[adapter.names.index("humor")] = 0.1
+    adapter.record("reply")
+    adapter.tick()
+
+    assert adapter.as_dict()["humor"] > 0.1
+
+
+def test_unknown_signal_ignored():
+    adapter = TraitAdapter(BASE)
+    adapter.record("applause")
+
+    assert not adapter.tick()
+
+
+def test_snapshot_and_rollback():
+    adapter = TraitAdapter(BASE, learning_rate=0.5)
+    first = adapter.snapshot()
+    adapter.record("ignored")
+    adapter.tick()
+    second = adapter.snapshot()
+    adapter.record("ignored")
+    adapter.tick()
+
+    assert adapter.rollback()
+    assert tuple(adapter.traits) == adapter._snapshots[-1][1]
+    assert adapter.rollback(first)
+    assert adapter.as_dict() == BASE
+    assert not adapter.rollback(second + 100)
+
+
+def test_rollback_discards_pending_feedback():
+    adapter = TraitAdapter(BASE)
+    adapter.snapshot()
+    adapter.record("ignored")
+    adapter.rollback()
+
+    assert not adapter.tick()
+
+
+def test_old_snapshots_dropped():
+    adapter = TraitAdapter(BASE, max_snapshots=2)
+    first = adapter.snapshot()
+    adapter.snapshot()
+    adapter.snapshot()
+
+    assert not adapter.rollback(first)
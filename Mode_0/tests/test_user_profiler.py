@@ -0,0 +1,36 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mode_0.persona.user_profiler import UserProfiler
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_deltas_once(mock_db):
+    mock_db.apply_user_deltas = AsyncMock()
+    profiler = UserProfiler(mock_db)
+
+    await profiler.update_profile("1", "love playing rhythm games", username="alice")
+    await profiler.update_profile("1", "rhythm games all day", username="alice")
+    await profiler.flush()
+
+    mock_db.apply_user_deltas.assert_awaited_once()
+    deltas = mock_db.apply_user_deltas.await_args.args[0]
+    assert deltas["1"]["messages"] == 2
+
+    await profiler.flush()
+    mock_db.apply_user_deltas.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_deltas(mock_db):
+    mock_db.apply_user_deltas = AsyncMock(side_effect=[RuntimeError("locked"), None])
+    profiler = UserProfiler(mock_db)
+    await profiler.update_profile("1", "hello there", username="alice")
+
+    with pytest.raises(RuntimeError):
+        await profiler.flush()
+    await profiler.flush()
+
+    deltas = mock_db.apply_user_deltas.await_args.args[0]
+    assert deltas["1"]["messages"] == 1